@@ -8,7 +8,7 @@ for enhanced security compared to traditional header-based token approaches.
 Key Features:
 - Extracts JWT tokens from 'auth_token' HTTP-only cookies
 - Validates token signature and expiration
-- Retrieves user from database based on token payload
+- Retrieves user from a Redis snapshot, or the database on a miss
 - Provides seamless integration with Django REST Framework
 - Enhances security by preventing XSS token theft
 
@@ -23,10 +23,45 @@ Dependencies:
 - Integrates with Django's User model for authentication
 """
 
+import hashlib
+import time
+
 from rest_framework.authentication import BaseAuthentication
 from rest_framework import exceptions
 from django.contrib.auth.models import User
 from apps.auth_app.jwt_utils import decode_jwt
+from apps.auth_app.serializers import ProfileSerializer
+from apps.auth_app.user_cache import cache_user, get_cached_user, user_generation
+
+
+# Per-process cache of verified JWT payloads: sha256(token) -> (payload, until)
+_PAYLOAD_TTL = 30
+_PAYLOAD_CACHE_MAX = 10_000
+_payload_cache = {}
+
+
+def _decoded(token):
+    """
+    Return the verified payload for `token`, reusing a recent verification.
+    
+    A hit is only served while the token is still unexpired, so caching
+    never extends a token's lifetime. Invalid tokens are not cached.
+    
+    Raises:
+        jwt.PyJWTError: If the token fails verification
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    now = time.time()
+    hit = _payload_cache.get(key)
+    if hit is not None and hit[1] > now:
+        return hit[0]
+
+    payload = decode_jwt(token)
+    if len(_payload_cache) >= _PAYLOAD_CACHE_MAX:
+        # Evict the oldest entry (dicts keep insertion order)
+        _payload_cache.pop(next(iter(_payload_cache), None), None)
+    _payload_cache[key] = (payload, min(now + _PAYLOAD_TTL, payload.get("exp", now)))
+    return payload
 
 
 class CookieJWTAuthentication(BaseAuthentication):
@@ -77,8 +112,9 @@ class CookieJWTAuthentication(BaseAuthentication):
 
         try:
             # Decode and validate JWT token
-            # This verifies signature and checks expiration
-            payload = decode_jwt(token)
+            # This verifies signature and checks expiration (result reused
+            # for up to _PAYLOAD_TTL seconds within this process)
+            payload = _decoded(token)
         except Exception as e:
             # Token is invalid, expired, or tampered with
             raise exceptions.AuthenticationFailed("Invalid or expired authentication token")
@@ -88,12 +124,23 @@ class CookieJWTAuthentication(BaseAuthentication):
         if not user_id:
             raise exceptions.AuthenticationFailed("Invalid token payload: missing user_id")
 
-        try:
-            # Retrieve user from database using ID from token
-            user = User.objects.get(id=user_id)
-        except User.DoesNotExist:
-            # User was deleted or doesn't exist anymore
-            raise exceptions.AuthenticationFailed("User account not found")
+        # Redis snapshot first; deleted/changed users are evicted by signals
+        user = get_cached_user(user_id)
+        if user is None:
+            # Read before the row so an invalidation racing this rebuild
+            # leaves the snapshot below unservable
+            generation = user_generation(user_id)
+            try:
+                # Retrieve user from database using ID from token, joining the
+                # profile so ProfileSerializer doesn't need a second query.
+                # password/is_active are needed by the views and the check below.
+                user = ProfileSerializer.setup_eager_loading(
+                    User.objects, "password", "is_active"
+                ).get(id=user_id)
+            except User.DoesNotExist:
+                # User was deleted or doesn't exist anymore
+                raise exceptions.AuthenticationFailed("User account not found")
+            cache_user(user, generation)
 
         # Optional: Check if user is active
         if not user.is_active:
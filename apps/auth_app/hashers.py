@@ -0,0 +1,21 @@
+"""
+Password hashers for the VulnScan authentication application.
+"""
+
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id with cost parameters sized for interactive login.
+    
+    Uses OWASP's first Argon2id profile (m=46 MiB, t=2, p=1) instead of
+    Django's defaults (100 MiB, 8 lanes), keeping register/login/
+    change-password well under the 500 ms UX budget on small gunicorn
+    workers. The algorithm name is unchanged, so hashes with other
+    parameters still verify and are upgraded on next login.
+    """
+
+    time_cost = 2
+    memory_cost = 46 * 1024  # KiB
+    parallelism = 1
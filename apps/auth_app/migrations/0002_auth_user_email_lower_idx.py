@@ -0,0 +1,19 @@
+# Functional index backing the case-insensitive email lookup in RegisterSerializer
+
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="CREATE INDEX IF NOT EXISTS auth_user_email_lower_idx ON auth_user (LOWER(email));",
+            reverse_sql="DROP INDEX IF EXISTS auth_user_email_lower_idx;",
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Make the LOWER(email) index unique so registration can rely on the INSERT
+# failing instead of a pre-check SELECT. Blank emails (e.g. superusers created
+# without one) are excluded from the constraint.
+
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0002_auth_user_email_lower_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=[
+                "DROP INDEX IF EXISTS auth_user_email_lower_idx;",
+                "CREATE UNIQUE INDEX IF NOT EXISTS auth_user_email_lower_uniq ON auth_user (LOWER(email)) WHERE email <> '';",
+            ],
+            reverse_sql=[
+                "DROP INDEX IF EXISTS auth_user_email_lower_uniq;",
+                "CREATE INDEX IF NOT EXISTS auth_user_email_lower_idx ON auth_user (LOWER(email));",
+            ],
+        ),
+    ]
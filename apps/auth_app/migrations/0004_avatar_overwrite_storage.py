@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-14 12:51
+
+import apps.auth_app.models
+import apps.auth_app.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0003_auth_user_email_lower_uniq'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='userprofile',
+            options={'verbose_name': 'User Profile', 'verbose_name_plural': 'User Profiles'},
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='avatar',
+            field=models.ImageField(blank=True, null=True, storage=apps.auth_app.storage.OverwriteStorage(), upload_to=apps.auth_app.models.avatar_upload_to),
+        ),
+    ]
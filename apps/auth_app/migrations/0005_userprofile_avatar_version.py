@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-14 12:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0004_avatar_overwrite_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='avatar_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
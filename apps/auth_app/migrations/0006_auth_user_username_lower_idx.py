@@ -0,0 +1,20 @@
+# Functional index backing LoginView's case-insensitive username lookup
+# (accounts created before usernames were lowercased keep their case)
+
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0005_userprofile_avatar_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="CREATE INDEX IF NOT EXISTS auth_user_username_lower_idx ON auth_user (LOWER(username));",
+            reverse_sql="DROP INDEX IF EXISTS auth_user_username_lower_idx;",
+        ),
+    ]
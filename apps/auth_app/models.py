@@ -16,10 +16,11 @@ Security Considerations:
 - User authentication relies on Django's secure User model
 """
 
-from pathlib import Path
 from django.db import models
 from django.contrib.auth.models import User
 
+from .storage import OverwriteStorage
+
 
 def avatar_upload_to(instance, filename):
     """
@@ -30,11 +31,17 @@ def avatar_upload_to(instance, filename):
     - Prevent filename conflicts between users
     - Maintain original file extension for compatibility
     
+    process_avatar always emits avatar.webp, so in practice the key is
+    stable per user and OverwriteStorage replaces it on re-upload.
+    
     Path Format: avatars/{user_id}/avatar{extension}
-    Example: avatars/42/avatar.jpg
+    Example: avatars/42/avatar.webp
     """
-    # Extract file extension from original filename
-    file_extension = Path(filename).suffix.lower()
+    # Extract file extension from original filename (plain string slicing;
+    # only the basename can contain the dot that matters)
+    base = filename[filename.rfind("/") + 1:]
+    dot = base.rfind(".")
+    file_extension = base[dot:].lower() if 0 < dot < len(base) - 1 else ""
     
     # Generate structured path: avatars/{user_id}/avatar{extension}
     return f"avatars/{instance.user_id}/avatar{file_extension}"
@@ -59,7 +66,14 @@ class UserProfile(models.Model):
     
     # User profile picture - optional field with custom upload path
     # Supports common image formats (validated in views)
-    avatar = models.ImageField(upload_to=avatar_upload_to, null=True, blank=True)
+    # Overwrites in place so re-uploads don't leave stale blobs behind
+    avatar = models.ImageField(
+        upload_to=avatar_upload_to, storage=OverwriteStorage(), null=True, blank=True
+    )
+
+    # Bumped by process_avatar_task on every new avatar; appended to the URL
+    # (?v=N) so clients and caches notice the overwrite of the fixed key
+    avatar_version = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         """
@@ -84,8 +98,9 @@ class UserProfile(models.Model):
         Returns:
             str or None: Absolute URL to avatar image or None if no avatar
         """
-        if self.avatar and hasattr(self.avatar, 'url'):
-            return self.avatar.url
+        if self.avatar:
+            url = self.avatar.url
+            return f"{url}?v={self.avatar_version}" if self.avatar_version else url
         return None
 
     def delete_avatar(self):
@@ -110,6 +125,7 @@ Table Structure:
 - id: Primary key (auto-increment)
 - user_id: Foreign key to auth_user (unique constraint)
 - avatar: VARCHAR containing file path to avatar image
+- avatar_version: Counter bumped on each processed upload (cache busting)
 
 Relationships:
 UserProfile (1) ───── (1) User
@@ -120,11 +136,11 @@ File Storage Structure:
 media/
 └── avatars/
     ├── 1/
-    │   └── avatar.jpg
+    │   └── avatar.webp
     ├── 2/
-    │   └── avatar.png
+    │   └── avatar.webp
     └── 42/
-        └── avatar.gif
+        └── avatar.webp
 
 Migration Safety:
 - No changes to field definitions
@@ -21,10 +21,34 @@ Key Features:
 """
 
 from django.contrib.auth.models import User
-from django.utils import timezone
-from django.contrib.auth.password_validation import validate_password
+from django.contrib.auth.password_validation import get_default_password_validators
+from django.db import IntegrityError, transaction
+from django.db.models import Manager, QuerySet, prefetch_related_objects
 from rest_framework import serializers
 
+# Password validators from AUTH_PASSWORD_VALIDATORS, cheapest check first.
+# Django caches the instances (and resets them on settings changes); calling it
+# here also loads CommonPasswordValidator's wordlist at import, not on first use.
+_VALIDATOR_COST = {
+    "MinimumLengthValidator": 0,
+    "NumericPasswordValidator": 1,
+    "CommonPasswordValidator": 2,
+    "UserAttributeSimilarityValidator": 3,  # SequenceMatcher per attribute
+}
+get_default_password_validators()
+
+
+def _password_validators():
+    return sorted(
+        get_default_password_validators(),
+        key=lambda v: _VALIDATOR_COST.get(type(v).__name__, len(_VALIDATOR_COST)),
+    )
+
+
+# Avatar upload limits, shared by AvatarImageField and ProfilePhotoUploadSerializer
+_ALLOWED_IMAGE_TYPES = frozenset({"image/jpeg", "image/png", "image/webp"})
+_MAX_AVATAR_BYTES = 5 * 1024 * 1024
+
 
 # =============================================================================
 # AUTHENTICATION SERIALIZERS
@@ -45,7 +69,7 @@ class RegisterSerializer(serializers.ModelSerializer):
     - password: Secure password (write-only, min 8 characters)
     
     Validation:
-    - Email must be unique across all users
+    - Email must be unique across all users (enforced on insert)
     - Password meets Django's security requirements
     - Names are trimmed and validated
     """
@@ -75,19 +99,18 @@ class RegisterSerializer(serializers.ModelSerializer):
 
     def validate_email(self, value):
         """
-        Validate email uniqueness (case-insensitive).
+        Normalize the email address.
+        
+        Uniqueness is enforced by the database (unique username and the
+        auth_user_email_lower_uniq index) when the user is created, so no
+        lookup is issued here.
         
         Args:
             value (str): Email address to validate
             
         Returns:
-            str: Validated email address
-            
-        Raises:
-            ValidationError: If email is already registered
+            str: Lower-cased, trimmed email address
         """
-        if User.objects.filter(email__iexact=value).exists():
-            raise serializers.ValidationError("Email address is already registered")
         return value.lower().strip()
 
     def create(self, validated_data):
@@ -95,26 +118,37 @@ class RegisterSerializer(serializers.ModelSerializer):
         Create a new user account with the provided data.
         
         Uses email as username and applies Django's secure user creation
-        which includes proper password hashing.
+        which includes proper password hashing. The INSERT runs in its own
+        transaction so a concurrent signup with the same email surfaces as
+        an IntegrityError instead of a duplicate account.
         
         Args:
             validated_data (dict): Validated user data
             
         Returns:
             User: Newly created user instance
+            
+        Raises:
+            ValidationError: If email is already registered
         """
         first = validated_data.get("first_name", "").strip()
         last = validated_data.get("last_name", "").strip()
-        email = validated_data.get("email").lower().strip()
+        email = validated_data.get("email")  # already normalized by validate_email
         pwd = validated_data.get("password")
         
-        return User.objects.create_user(
-            username=email,  # Use email as username for simplicity
-            email=email, 
-            password=pwd,
-            first_name=first, 
-            last_name=last
-        )
+        try:
+            with transaction.atomic():
+                return User.objects.create_user(
+                    username=email,  # Use email as username for simplicity
+                    email=email, 
+                    password=pwd,
+                    first_name=first, 
+                    last_name=last
+                )
+        except IntegrityError:
+            raise serializers.ValidationError({
+                "email": ["Email address is already registered"]
+            })
 
 
 class LoginSerializer(serializers.Serializer):
@@ -140,12 +174,129 @@ class LoginSerializer(serializers.Serializer):
 # PROFILE SERIALIZERS
 # =============================================================================
 
+def _abs_prefix(request):
+    """scheme://host for `request`, or None without a request."""
+    return f"{request.scheme}://{request.get_host()}" if request else None
+
+
+def _avatar_url(user, request, abs_prefix):
+    """
+    Get absolute URL for user's avatar image.
+    
+    Args:
+        user (User): User instance (profile ideally select_related)
+        request (HttpRequest or None): Request used to absolutize the URL
+        abs_prefix (str or None): Cached _abs_prefix(request)
+        
+    Returns:
+        str or None: Absolute URL to avatar (relative without a request),
+        or None if not set
+    """
+    profile = getattr(user, "profile", None)
+    if profile is None or not profile.avatar:
+        return None
+    return _absolutize(profile.get_avatar_url(), request, abs_prefix)
+
+
+def _absolutize(url, request, abs_prefix):
+    """Make a media URL absolute for `request`; unchanged without one."""
+    if not request or not url:
+        return url
+    if url.startswith("/") and not url.startswith("//"):
+        return abs_prefix + url
+    return request.build_absolute_uri(url)
+
+
+def with_absolute_avatar(data, request):
+    """
+    Copy of a profile payload built without a request (e.g. ProfileView's
+    cached one) with avatarUrl made absolute, as serialize_profile(user,
+    request) returns it.
+    """
+    return {**data, "avatarUrl": _absolutize(data.get("avatarUrl"), request, _abs_prefix(request))}
+
+
+def iso_utc(value):
+    """
+    ISO 8601 string for an aware datetime, in DRF's JSON encoder format:
+    UTC written as 'Z' (2025-10-01T09:00:00Z).
+
+    Formatted here rather than by the renderer so the wire format doesn't
+    depend on whether orjson or DRF's encoder is in use.
+    """
+    text = value.isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+
+def _profile_dict(user, avatar_url):
+    return {
+        "userId": f"u_{user.id}",
+        "email": user.email,
+        "firstName": user.first_name,
+        "lastName": user.last_name,
+        "createdAt": iso_utc(user.date_joined),
+        "avatarUrl": avatar_url,
+    }
+
+
+def serialize_profile(user, request=None):
+    """
+    Build ProfileSerializer's output for one user without a serializer.
+    
+    Views returning a single profile call this directly, skipping DRF
+    serializer construction and the ReturnDict wrapper around .data.
+    
+    Args:
+        user (User): User instance
+        request (HttpRequest, optional): Makes avatarUrl absolute
+        
+    Returns:
+        dict: camelCase profile data
+    """
+    return _profile_dict(user, _avatar_url(user, request, _abs_prefix(request)))
+
+
+class ProfileListSerializer(serializers.ListSerializer):
+    """
+    List serializer used by ProfileSerializer(many=True).
+    
+    Loads missing profiles for all users in one query so callers that
+    forget setup_eager_loading() don't fall into an N+1 on avatarUrl.
+    """
+
+    def __init__(self, instance=None, *args, **kwargs):
+        if isinstance(instance, (list, tuple, QuerySet)):
+            instance = list(instance)
+            # No-op when the profiles were already select_related/prefetched
+            prefetch_related_objects(instance, "profile")
+        super().__init__(instance, *args, **kwargs)
+
+    def to_representation(self, data):
+        """
+        Build all profile payloads in one comprehension.
+        
+        Same output as ProfileSerializer.to_representation per row, without
+        the per-item child dispatch done by ListSerializer.
+        
+        Args:
+            data (list | QuerySet | Manager): Users to serialize
+            
+        Returns:
+            list: camelCase profile dicts
+        """
+        iterable = data.all() if isinstance(data, Manager) else data
+        avatar_url = self.child._avatar_url  # request/abs prefix resolved once on the child
+        return [_profile_dict(u, avatar_url(u)) for u in iterable]
+
+
 class ProfileSerializer(serializers.ModelSerializer):
     """
     Serializer for reading user profile data with formatted output.
     
     Provides user profile information in camelCase format for frontend
-    consumption, including generated user ID and avatar URL.
+    consumption, including generated user ID and avatar URL. Output is
+    built directly in to_representation() rather than through per-field
+    method dispatch; the declared fields document the response shape.
     
     Fields:
     - userId: Generated user identifier (u_{id})
@@ -156,7 +307,8 @@ class ProfileSerializer(serializers.ModelSerializer):
     - avatarUrl: Absolute URL to user's avatar image
     """
     
-    userId = serializers.SerializerMethodField(
+    userId = serializers.CharField(
+        read_only=True,
         help_text="Unique user identifier in format u_{id}"
     )
     firstName = serializers.CharField(
@@ -167,59 +319,63 @@ class ProfileSerializer(serializers.ModelSerializer):
         source="last_name",
         help_text="User's last name"
     )
-    createdAt = serializers.SerializerMethodField(
+    createdAt = serializers.CharField(
+        read_only=True,
         help_text="Account creation timestamp in ISO 8601 format"
     )
-    avatarUrl = serializers.SerializerMethodField(
+    avatarUrl = serializers.CharField(
+        read_only=True,
+        allow_null=True,
         help_text="Absolute URL to user's profile picture"
     )
 
     class Meta:
         model = User
         fields = ("userId", "email", "firstName", "lastName", "createdAt", "avatarUrl")
+        list_serializer_class = ProfileListSerializer
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._request = self.context.get("request")
+        # scheme://host resolved once instead of per build_absolute_uri() call
+        self._abs_prefix = _abs_prefix(self._request)
+
+    # Columns read by to_representation(); everything else on auth_user is deferred
+    EAGER_FIELDS = (
+        "id", "email", "first_name", "last_name", "date_joined",
+        "profile__user", "profile__avatar", "profile__avatar_version",
+    )
 
-    def get_userId(self, obj):
+    @classmethod
+    def setup_eager_loading(cls, queryset, *extra_fields):
         """
-        Generate formatted user ID for frontend consumption.
-        
-        Args:
-            obj (User): User instance
-            
-        Returns:
-            str: Formatted user ID (e.g., "u_42")
-        """
-        return f"u_{obj.id}"
+        Join the related profile and load only the columns this serializer reads.
 
-    def get_createdAt(self, obj):
-        """
-        Get account creation timestamp in ISO format.
-        
         Args:
-            obj (User): User instance
-            
+            queryset (QuerySet): User queryset feeding this serializer
+            *extra_fields (str): Additional User columns the caller needs
+                (e.g. "password" for check_password)
+
         Returns:
-            str: ISO 8601 formatted timestamp
+            QuerySet: Queryset with the profile fetched via LEFT OUTER JOIN
         """
-        return (obj.date_joined.isoformat()
-                if hasattr(obj, "date_joined")
-                else timezone.now().isoformat())
+        return queryset.select_related("profile").only(*cls.EAGER_FIELDS, *extra_fields)
 
-    def get_avatarUrl(self, obj):
+    def to_representation(self, instance):
         """
-        Get absolute URL for user's avatar image.
+        Build the profile payload for a single user.
         
         Args:
-            obj (User): User instance
+            instance (User): User instance
             
         Returns:
-            str or None: Absolute URL to avatar or None if not set
+            dict: camelCase profile data
         """
-        request = self.context.get("request")
-        avatar = getattr(getattr(obj, "profile", None), "avatar", None)
-        if not avatar:
-            return None
-        url = avatar.url
-        return request.build_absolute_uri(url) if request else url
+        return _profile_dict(instance, self._avatar_url(instance))
+
+    def _avatar_url(self, obj):
+        """Avatar URL for `obj` using this serializer's request and cached prefix."""
+        return _avatar_url(obj, self._request, self._abs_prefix)
 
 
 class ProfileNameUpdateSerializer(serializers.Serializer):
@@ -227,43 +383,52 @@ class ProfileNameUpdateSerializer(serializers.Serializer):
     Serializer for updating user's first and last names.
     
     Supports both snake_case and camelCase field names for better
-    frontend compatibility and developer experience.
+    frontend compatibility and developer experience. Only the camelCase
+    fields are declared; snake_case keys are mapped onto them before
+    validation so each name is bound and validated once.
     
     Fields (both naming conventions supported):
-    - first_name / firstName: User's first name
-    - last_name / lastName: User's last name
+    - firstName / first_name: User's first name
+    - lastName / last_name: User's last name
     """
     
-    # Snake_case fields (Django convention)
-    first_name = serializers.CharField(
-        required=False, 
-        allow_blank=True, 
-        max_length=150,
-        help_text="User's first name (snake_case)"
-    )
-    last_name = serializers.CharField(
-        required=False, 
-        allow_blank=True, 
-        max_length=150,
-        help_text="User's last name (snake_case)"
-    )
+    # snake_case aliases accepted in requests -> declared camelCase field
+    SNAKE_CASE_ALIASES = (("first_name", "firstName"), ("last_name", "lastName"))
     
-    # CamelCase fields (frontend convention)
     firstName = serializers.CharField(
         source="first_name", 
         required=False, 
         allow_blank=True, 
         max_length=150,
-        help_text="User's first name (camelCase)"
+        help_text="User's first name (camelCase, first_name also accepted)"
     )
     lastName = serializers.CharField(
         source="last_name",  
         required=False, 
         allow_blank=True, 
         max_length=150,
-        help_text="User's last name (camelCase)"
+        help_text="User's last name (camelCase, last_name also accepted)"
     )
 
+    def to_internal_value(self, data):
+        """
+        Map snake_case keys onto the camelCase fields before validation.
+        
+        camelCase wins when a request sends both spellings.
+        
+        Args:
+            data (dict): Raw request data
+            
+        Returns:
+            dict: Validated attributes keyed by model field name
+        """
+        data = {**data}
+        for snake, camel in self.SNAKE_CASE_ALIASES:
+            if snake in data:
+                value = data.pop(snake)
+                data.setdefault(camel, value)
+        return super().to_internal_value(data)
+
     def validate(self, attrs):
         """
         Normalize and validate name fields.
@@ -328,15 +493,26 @@ class ChangePasswordSerializer(serializers.Serializer):
             dict: Validated data
             
         Raises:
-            ValidationError: If passwords don't match or are insecure
+            ValidationError: If passwords don't match, reuse the current
+                password, or are insecure
         """
         if data["newPassword"] != data["newPasswordConfirm"]:
             raise serializers.ValidationError({
                 "newPasswordConfirm": "New passwords do not match"
             })
-            
-        # Validate password strength using Django's validators
-        validate_password(data["newPassword"], user=self.context.get("user"))
+
+        # Cheap rejection before the validator chain (wordlist lookup,
+        # SequenceMatcher against user attributes) runs
+        if data["newPassword"] == data["currentPassword"]:
+            raise serializers.ValidationError({
+                "newPassword": "New password must differ from the current password"
+            })
+
+        # Validate password strength using Django's validators; stop at the
+        # first failure so the expensive similarity check runs last, if at all
+        user = self.context.get("user")
+        for validator in _password_validators():
+            validator.validate(data["newPassword"], user)
         
         return data
 
@@ -400,20 +576,67 @@ class DeleteAccountSerializer(serializers.Serializer):
 # FILE UPLOAD SERIALIZERS  
 # =============================================================================
 
+def _sniff_image_type(file):
+    """
+    Identify an upload from its first 12 bytes.
+    
+    Args:
+        file (UploadedFile): Uploaded file, rewound afterwards
+        
+    Returns:
+        str or None: Detected MIME type, or None if not JPEG/PNG/WebP
+    """
+    head = file.read(12)
+    file.seek(0)
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+class AvatarImageField(serializers.ImageField):
+    """
+    ImageField that rejects oversized or non-image uploads before Pillow runs.
+    
+    The size check needs no read at all and the magic-byte check reads
+    12 bytes, so bad uploads never reach the full image parse performed
+    by ImageField.
+    """
+    
+    max_bytes = _MAX_AVATAR_BYTES
+    default_error_messages = {
+        "too_large": "Image file too large. Maximum size is {max_mb}MB",
+        "bad_format": "Only JPEG, PNG, and WebP image formats are allowed",
+    }
+
+    def to_internal_value(self, data):
+        if hasattr(data, "read") and hasattr(data, "size"):
+            # Validate file size
+            if data.size > self.max_bytes:
+                self.fail("too_large", max_mb=self.max_bytes // (1024 * 1024))
+            # Validate actual content, not the browser-supplied type
+            if _sniff_image_type(data) is None:
+                self.fail("bad_format")
+        return super().to_internal_value(data)
+
+
 class ProfilePhotoUploadSerializer(serializers.Serializer):
     """
     Serializer for user profile photo uploads with security validation.
     
     Validates uploaded images for:
-    - File type (JPEG, PNG, WebP only)
-    - File size (maximum 5MB)
+    - File size (maximum 5MB, checked before reading)
+    - File signature (JPEG, PNG, WebP magic bytes)
     - Content type verification
     
     Fields:
     - photo: Image file to upload as profile picture
     """
     
-    photo = serializers.ImageField(
+    photo = AvatarImageField(
         help_text="Profile picture image file (JPEG, PNG, or WebP)"
     )
 
@@ -421,6 +644,8 @@ class ProfilePhotoUploadSerializer(serializers.Serializer):
         """
         Validate uploaded photo file.
         
+        Size and file signature are already checked by AvatarImageField.
+        
         Args:
             file (InMemoryUploadedFile): Uploaded image file
             
@@ -430,18 +655,8 @@ class ProfilePhotoUploadSerializer(serializers.Serializer):
         Raises:
             ValidationError: If file fails validation checks
         """
-        max_mb = 5
-        max_size = max_mb * 1024 * 1024  # 5MB in bytes
-        
-        # Validate file size
-        if file.size > max_size:
-            raise serializers.ValidationError(
-                f"Image file too large. Maximum size is {max_mb}MB"
-            )
-            
         # Validate file type
-        allowed_types = {"image/jpeg", "image/png", "image/webp"}
-        if file.content_type not in allowed_types:
+        if file.content_type not in _ALLOWED_IMAGE_TYPES:
             raise serializers.ValidationError(
                 "Only JPEG, PNG, and WebP image formats are allowed"
             )
@@ -454,7 +669,7 @@ Serialization Patterns Used:
 
 1. ModelSerializer: For User model with automatic field handling
 2. Serializer: For custom validation and non-model operations  
-3. SerializerMethodField: For computed properties and custom formatting
+3. to_representation override: For computed properties on hot read paths (ProfileSerializer)
 4. Source parameter: For field name mapping between Python and JSON
 
 Field Naming Strategy:
@@ -0,0 +1,19 @@
+"""
+Storage backends for the VulnScan authentication application.
+"""
+
+from django.core.files.storage import FileSystemStorage
+
+
+class OverwriteStorage(FileSystemStorage):
+    """
+    FileSystemStorage that replaces an existing file instead of renaming.
+    
+    Avatars live at a fixed key (avatars/{user_id}/avatar.webp). The default
+    storage would save a re-upload as avatar_<random>.webp and leave the
+    previous blob behind; this one writes over it in place.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("allow_overwrite", True)
+        super().__init__(**kwargs)
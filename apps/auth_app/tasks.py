@@ -0,0 +1,76 @@
+"""
+Background tasks for the VulnScan authentication application.
+
+Avatar resizing is CPU-bound (decode, crop, re-encode) and used to run
+inside the upload request. ProfilePhotoView now only stores the raw upload
+and enqueues process_avatar_task, which produces the final avatar on the
+"media" Celery queue. Saving the profile fires the post_save signal that
+evicts the cached user/profile payload (user_cache.forget_user).
+"""
+
+from celery import shared_task  # type: ignore[reportMissingImports]
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+
+from .models import UserProfile
+from .utils.images import process_avatar
+
+
+@shared_task(name="apps.auth_app.tasks.process_avatar_task", ignore_result=True)
+def process_avatar_task(user_id: int, tmp_path: str):
+    """
+    Resize a raw avatar upload and attach it to the user's profile.
+
+    Args:
+        user_id (int): Owner of the upload
+        tmp_path (str): Storage path of the raw upload saved by the view;
+            always removed once the task finishes
+    """
+    try:
+        # Profiles are created with the user (signals.ensure_profile), so a
+        # single lookup normally suffices; without one, the account may have
+        # been deleted while the task was queued
+        profile = UserProfile.objects.filter(user_id=user_id).first()
+        if profile is None:
+            if not User.objects.filter(id=user_id).exists():
+                return
+            profile = UserProfile.objects.create(user_id=user_id)
+
+        with default_storage.open(tmp_path, "rb") as raw:
+            processed = process_avatar(raw)
+
+        old_name = profile.avatar.name if profile.avatar else None
+
+        # OverwriteStorage replaces avatars/{id}/avatar.webp in place; the
+        # version bump changes avatarUrl so clients see the new image. The
+        # old avatar stays served until this point.
+        profile.avatar.save(processed.name, processed, save=False)
+        profile.avatar_version += 1
+        profile.save(update_fields=["avatar", "avatar_version"])
+
+        # Only legacy avatars (.jpg/.png from before WebP output) differ
+        if old_name and old_name != profile.avatar.name:
+            try:
+                profile.avatar.storage.delete(old_name)
+            except Exception:
+                pass
+    finally:
+        default_storage.delete(tmp_path)
+
+
+@shared_task(name="apps.auth_app.tasks.delete_avatar_file", ignore_result=True)
+def delete_avatar_file(path: str):
+    """
+    Remove a detached avatar from storage.
+
+    Queued by ProfilePhotoView.delete so a remote storage round trip
+    (e.g. an S3 DELETE) never sits on the request path.
+
+    Args:
+        path (str): Storage name of the avatar that was cleared
+    """
+    # Avatar keys are stable per user: a re-upload processed since the
+    # delete request may already own this path again
+    if UserProfile.objects.filter(avatar=path).exists():
+        return
+    UserProfile._meta.get_field("avatar").storage.delete(path)
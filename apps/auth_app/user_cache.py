@@ -0,0 +1,205 @@
+"""
+Redis snapshot of authenticated users for CookieJWTAuthentication.
+
+Every authenticated request used to resolve the JWT's user_id with a
+SELECT on auth_user (joined to the profile). The columns ProfileSerializer
+and the views read are small and change rarely, so they are kept in Redis
+under vulnscanner:authuser:{user_id} and rebuilt into an unsaved-looking
+but DB-backed User via Model.from_db().
+
+Key Points:
+- Only used when a Redis client is available; the per-process memory
+  fallback of apps.scans_app.utils.cache can't be invalidated across
+  workers, so without Redis every request goes to the database as before
+- The password hash is never cached; the rebuilt User defers it, so
+  check_password() loads it with a single query on the views that need it
+- Invalidation is signal-driven (signals.py): any save/delete of the User
+  or its UserProfile drops the snapshot and bumps the user's generation
+  counter (vulnscanner:authuser_gen:{user_id})
+- Each entry records the generation read before its row was loaded and is
+  only served while the counter still matches, so a cache-miss rebuild
+  racing an invalidation can't put the stale row back
+- Writes that bypass signals (QuerySet.update, raw SQL) are bounded by the
+  short USER_CACHE_TTL, in line with the 30 s JWT payload cache
+- ProfileView's serialized payload is cached next to it
+  (vulnscanner:profile:{user_id}) and dropped by the same signals
+"""
+
+import json
+from datetime import datetime
+
+from django.contrib.auth.models import User
+
+from apps.scans_app.utils import cache
+from .models import UserProfile
+
+# Upper bound on staleness for writes that bypass signals (QuerySet.update);
+# the snapshot carries is_active, so keep it close to the JWT payload cache
+USER_CACHE_TTL = 30
+
+# ProfileView payloads change only through the same writes
+PROFILE_CACHE_TTL = 60 * 5
+
+# Outlives every entry written before a bump, so an expired counter can't
+# make an old entry match again
+_GEN_TTL = 2 * max(USER_CACHE_TTL, PROFILE_CACHE_TTL)
+
+# Columns kept in the snapshot: what ProfileSerializer reads plus is_active
+_USER_FIELDS = ("id", "email", "first_name", "last_name", "date_joined", "is_active")
+
+
+def _key(user_id):
+    return cache.cache_key("authuser", str(user_id))
+
+
+def _profile_key(user_id):
+    return cache.cache_key("profile", str(user_id))
+
+
+def _gen_key(user_id):
+    return cache.cache_key("authuser_gen", str(user_id))
+
+
+def user_generation(user_id):
+    """
+    Current invalidation generation of `user_id`.
+
+    Read it before loading the rows passed to cache_user()/cache_profile(),
+    so an invalidation in between makes the new entry unservable.
+
+    Returns:
+        int: Generation, or -1 if Redis couldn't be read (nothing is cached)
+    """
+    r = cache.get_client()
+    if r is None:
+        return -1
+    try:
+        return int(r.get(_gen_key(user_id)) or 0)
+    except Exception:
+        return -1
+
+
+def _get_current(key, user_id):
+    """Entry stored at `key` if it was written at the current generation."""
+    r = cache.get_client()
+    if r is None:
+        return None
+    try:
+        raw, gen = r.mget(key, _gen_key(user_id))
+        entry = json.loads(raw) if raw else None
+    except Exception:
+        return None
+    if not isinstance(entry, dict) or entry.get("gen") != int(gen or 0):
+        return None
+    return entry
+
+
+def _from_db(model, values):
+    """Rebuild a model instance from a partial column dict; the rest is deferred."""
+    names = [f.attname for f in model._meta.concrete_fields if f.attname in values]
+    return model.from_db("default", names, [values[n] for n in names])
+
+
+def cache_user(user, generation=None):
+    """
+    Store a snapshot of `user` (and its profile) for later requests.
+
+    Args:
+        user (User): Freshly loaded or just-authenticated user
+        generation (int, optional): user_generation() read before `user`
+            was loaded; defaults to the current one
+    """
+    if cache.get_client() is None:
+        return
+    if generation is None:
+        generation = user_generation(user.id)
+    if generation < 0:
+        return
+    data = {name: getattr(user, name) for name in _USER_FIELDS}
+    data["gen"] = generation
+    data["date_joined"] = user.date_joined.isoformat()
+    profile = getattr(user, "profile", None)
+    data["profile"] = (
+        {
+            "id": profile.id,
+            "avatar": profile.avatar.name or "",
+            "avatar_version": profile.avatar_version,
+        }
+        if profile else None
+    )
+    cache.set_json(_key(user.id), data, ttl=USER_CACHE_TTL)
+
+
+def get_cached_user(user_id):
+    """
+    Rebuild a User from its cached snapshot.
+
+    Args:
+        user_id (int): ID from the JWT payload
+
+    Returns:
+        User or None: User with the profile relation pre-populated, or
+        None on a cache miss / unreadable entry
+    """
+    data = _get_current(_key(user_id), user_id)
+    if not data:
+        return None
+    data.pop("gen")
+    try:
+        profile_data = data.pop("profile")
+        data["date_joined"] = datetime.fromisoformat(data["date_joined"])
+        user = _from_db(User, data)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    if profile_data:
+        user.profile = _from_db(UserProfile, {**profile_data, "user_id": user.id})
+    else:
+        # Remember "no profile" so accessing user.profile doesn't query
+        User._meta.get_field("profile").set_cached_value(user, None)
+    return user
+
+
+def get_cached_profile(user_id):
+    """
+    Return ProfileView's cached payload for `user_id`, or None on a miss.
+    """
+    entry = _get_current(_profile_key(user_id), user_id)
+    return entry.get("data") if entry else None
+
+
+def cache_profile(user_id, data, generation):
+    """
+    Store ProfileSerializer output for `user_id`.
+
+    Args:
+        user_id (int): Owner of the profile
+        data (dict): Serialized profile (JSON-ready; createdAt is already
+            an ISO 8601 string)
+        generation (int): user_generation() read before `data` was built
+    """
+    if cache.get_client() is None or generation < 0:
+        return
+    raw = json.dumps({"gen": generation, "data": data})
+    cache.set(_profile_key(user_id), raw, ttl=PROFILE_CACHE_TTL)
+
+
+def forget_user(user_id):
+    """
+    Invalidate the cached snapshot and profile payload for `user_id`.
+
+    Bumping the generation also voids entries a concurrent cache miss is
+    about to write from rows read before this call.
+    """
+    r = cache.get_client()
+    if r is not None:
+        try:
+            gen_key = _gen_key(user_id)
+            pipe = r.pipeline()
+            pipe.incr(gen_key)
+            pipe.expire(gen_key, _GEN_TTL)
+            pipe.execute()
+        except Exception:
+            pass
+    cache.delete(_key(user_id))
+    cache.delete(_profile_key(user_id))
@@ -1,13 +1,53 @@
 from io import BytesIO
 from PIL import Image, ImageOps
+from django.core.files import File
 from django.core.files.base import ContentFile
 
-def process_avatar(file, size=(400, 400)):
-    img = Image.open(file)
-    img = ImageOps.exif_transpose(img)          # fix orientation
-    img = ImageOps.fit(img, size, Image.LANCZOS) # square crop + resize
+try:
+    import pyvips  # optional; streams tiles instead of decoding the whole image
+except Exception:  # pragma: no cover - missing module or libvips shared library
+    pyvips = None
+
+
+def _process_avatar_vips(file, size):
+    # thumbnail_buffer shrinks on load, applies EXIF orientation and
+    # centre-crops to the exact box in one pipeline
+    img = pyvips.Image.thumbnail_buffer(file.read(), size[0], height=size[1], crop="centre")
+    img = img.colourspace("srgb")
+    return ContentFile(img.write_to_buffer(".webp[Q=90]"), name="avatar.webp")
+
+
+def _process_avatar_pillow(file, size):
+    with Image.open(file) as src:
+        # JPEG only: let libjpeg decode at 1/2, 1/4 or 1/8 scale (never below
+        # `size`) instead of materializing the full-resolution bitmap
+        src.draft("RGB", size)
+        img = ImageOps.exif_transpose(src)           # fix orientation
+        img = ImageOps.fit(img, size, Image.LANCZOS) # square crop + resize
 
     buf = BytesIO()
-    fmt = "WEBP" if img.mode in ("RGBA","LA") else "JPEG"
-    img.convert("RGB").save(buf, fmt, quality=90)
-    return ContentFile(buf.getvalue(), name="avatar." + fmt.lower())
+    mode = "RGBA" if img.mode in ("RGBA", "LA", "PA") else "RGB"
+    # Pillow's WebP encoder has no optimize/progressive options (those were
+    # spelled out False while avatars were JPEG); it encodes in one pass
+    img.convert(mode).save(buf, "WEBP", quality=90)
+    # Hand storage the buffer itself; it reads it via chunks() instead of
+    # taking a full getvalue() copy first
+    buf.seek(0)
+    return File(buf, name="avatar.webp")
+
+
+def process_avatar(file, size=(400, 400)):
+    """
+    Square-crop and re-encode an uploaded avatar.
+
+    Uses libvips when pyvips is importable and falls back to Pillow otherwise
+    (or if libvips cannot decode the upload). Output is always WebP
+    (transparency kept) so the stored key is stable per user; returns a
+    Django File named avatar.webp either way.
+    """
+    if pyvips is not None:
+        try:
+            return _process_avatar_vips(file, size)
+        except pyvips.Error:
+            file.seek(0)
+    return _process_avatar_pillow(file, size)
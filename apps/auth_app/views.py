@@ -21,13 +21,20 @@ Security Features:
 - Input validation at both serializer and view levels
 """
 
-from django.contrib.auth import authenticate
+import functools
+import json
+import uuid
+
+from django.contrib.auth.hashers import check_password, make_password
 from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.db.models.functions import Lower
+from django.http import HttpResponse
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 
-from rest_framework import permissions, status
+from rest_framework import permissions, serializers, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.parsers import MultiPartParser, FormParser
@@ -42,9 +49,12 @@ from .serializers import (
     DeleteAccountSerializer,
     ProfilePhotoUploadSerializer,
     ProfileNameUpdateSerializer,
+    iso_utc,
+    serialize_profile,
+    with_absolute_avatar,
 )
-from .utils.images import process_avatar
-from .models import UserProfile
+from .tasks import delete_avatar_file, process_avatar_task
+from .user_cache import cache_profile, cache_user, forget_user, get_cached_profile, user_generation
 
 # Authentication cookie configuration
 AUTH_COOKIE_NAME = "auth_token"
@@ -53,6 +63,46 @@ AUTH_COOKIE_AGE = 7 * 24 * 60 * 60  # 7 days in seconds
 # Security note: Set secure=True in production when using HTTPS
 COOKIE_SECURE_SETTING = False  # Change to True in production environment
 
+# Shared set_cookie() options for the auth cookie
+_AUTH_COOKIE_KWARGS = {
+    "httponly": True,                 # Prevent XSS access
+    "samesite": "Strict",             # CSRF protection
+    "secure": COOKIE_SECURE_SETTING,  # HTTPS only in production
+    "max_age": AUTH_COOKIE_AGE,       # 7 days expiration
+    "path": "/",                      # Available across entire site
+}
+
+
+def _static_error(code, message):
+    """
+    Pre-encode a fixed error body once; each call builds a fresh response.
+    
+    Used for the message-only errors on the credential paths, which are the
+    ones hammered by credential stuffing; skips renderer negotiation and
+    JSON encoding per response.
+    """
+    body = json.dumps(
+        {"error": {"code": code, "message": message}}, separators=(",", ":")
+    ).encode()
+    return lambda: HttpResponse(body, status=code, content_type="application/json")
+
+
+_EMAIL_TAKEN = _static_error(409, "Email already registered")
+_INVALID_CREDENTIALS = _static_error(401, "Invalid email or password")
+_WRONG_CURRENT_PASSWORD = _static_error(401, "Current password is incorrect")
+
+
+@functools.cache
+def _dummy_password_hash():
+    """Hash checked against on unknown emails; built on first use, per process."""
+    return make_password("not-a-real-password")
+
+
+def _set_auth_cookie(response, token):
+    """Attach the JWT auth cookie to `response` and return it."""
+    response.set_cookie(AUTH_COOKIE_NAME, token, **_AUTH_COOKIE_KWARGS)
+    return response
+
 
 class RegisterView(APIView):
     """
@@ -63,7 +113,7 @@ class RegisterView(APIView):
     
     Flow:
     1. Validate registration data using RegisterSerializer
-    2. Create new user with hashed password
+    2. Create new user with hashed password (409 if the email is taken)
     3. Generate JWT token for the new user
     4. Set HTTP-only cookie with the token
     5. Return user profile data with 201 status
@@ -96,11 +146,15 @@ class RegisterView(APIView):
         serializer = RegisterSerializer(data=request.data)
         
         if serializer.is_valid():
-            # Create new user account
-            user = serializer.save()
+            # Create new user account; the unique index rejects duplicates
+            try:
+                user = serializer.save()
+            except serializers.ValidationError:
+                return _EMAIL_TAKEN()
             
             # Generate JWT token for automatic login
             token = create_jwt_for_user(user)
+            cache_user(user)  # first authenticated request skips the DB
             
             # Build success response with user data
             response = Response(
@@ -110,33 +164,15 @@ class RegisterView(APIView):
                         "email": user.email,
                         "firstName": user.first_name,
                         "lastName": user.last_name,
-                        "createdAt": getattr(user, "date_joined", timezone.now()).isoformat(),
+                        "createdAt": iso_utc(user.date_joined or timezone.now()),
                     }
                 },
                 status=status.HTTP_201_CREATED,
             )
             
             # Set authentication cookie for automatic login
-            response.set_cookie(
-                AUTH_COOKIE_NAME,
-                token,
-                httponly=True,      # Prevent XSS access
-                samesite="Strict",  # CSRF protection
-                secure=COOKIE_SECURE_SETTING,  # HTTPS only in production
-                max_age=AUTH_COOKIE_AGE,       # 7 days expiration
-                path="/",           # Available across entire site
-            )
-            return response
-
-        # Handle specific email conflict error
-        if "email" in serializer.errors and any(
-            "already registered" in str(m) for m in serializer.errors["email"]
-        ):
-            return Response(
-                {"error": {"code": 409, "message": "Email already registered"}}, 
-                status=409
-            )
-            
+            return _set_auth_cookie(response, token)
+
         # Return generic validation errors
         return Response(
             {"error": {"code": 400, "message": serializer.errors}}, 
@@ -153,7 +189,7 @@ class LoginView(APIView):
     
     Flow:
     1. Validate login credentials using LoginSerializer
-    2. Authenticate user with Django's authenticate()
+    2. Look up the user by normalized email and verify the password hash
     3. Generate JWT token for authenticated user
     4. Set HTTP-only cookie with the token
     5. Return user profile data
@@ -187,16 +223,30 @@ class LoginView(APIView):
         email = serializer.validated_data["email"]
         password = serializer.validated_data["password"]
 
-        # Authenticate user with Django's built-in system
-        user = authenticate(request, username=email, password=password)
+        # One SELECT on LOWER(username) (auth_user_username_lower_idx) with
+        # only the columns login and the auth cache need, then verify the hash
+        # here instead of going through authenticate()'s backend loop. New
+        # accounts store the lowercased email; older ones may keep its case.
+        candidates = list(
+            ProfileSerializer.setup_eager_loading(User.objects, "password", "is_active", "username")
+            .alias(username_lower=Lower("username"))
+            .filter(username_lower=email.lower())[:2]
+        )
+        if len(candidates) == 1:
+            user = candidates[0]
+        else:
+            # Accounts differing only in case need the exact spelling
+            user = next((u for u in candidates if u.username == email), None)
         if user is None:
-            return Response(
-                {"error": {"code": 401, "message": "Invalid email or password"}}, 
-                status=401
-            )
+            # Same hash verification as a real account, so response time
+            # doesn't reveal whether the email is registered
+            check_password(password, _dummy_password_hash())
+        if user is None or not user.check_password(password) or not user.is_active:
+            return _INVALID_CREDENTIALS()
 
         # Generate JWT token for authenticated session
         token = create_jwt_for_user(user)
+        cache_user(user)  # first authenticated request skips the DB
         
         # Build success response
         response = Response(
@@ -212,16 +262,7 @@ class LoginView(APIView):
         )
         
         # Set authentication cookie
-        response.set_cookie(
-            AUTH_COOKIE_NAME,
-            token,
-            httponly=True,
-            samesite="Strict",
-            secure=COOKIE_SECURE_SETTING,
-            max_age=AUTH_COOKIE_AGE,
-            path="/",
-        )
-        return response
+        return _set_auth_cookie(response, token)
 
 
 class LogoutView(APIView):
@@ -249,6 +290,7 @@ class LogoutView(APIView):
         Returns:
             Response: 204 No Content with cleared auth cookie
         """
+        forget_user(request.user.id)
         response = Response(status=status.HTTP_204_NO_CONTENT)
         response.delete_cookie(AUTH_COOKIE_NAME, path="/")
         return response
@@ -278,10 +320,15 @@ class ProfileView(APIView):
         Returns:
             Response: 200 OK with serialized user profile data
         """
-        return Response(
-            {"user": ProfileSerializer(request.user).data}, 
-            status=200
-        )
+        # Prebuilt payload from Redis; evicted whenever the user/profile changes.
+        # It is cached host-independent and avatarUrl is made absolute per
+        # request, matching the URLs the photo/name endpoints return.
+        data = get_cached_profile(request.user.id)
+        if data is None:
+            generation = user_generation(request.user.id)
+            data = serialize_profile(request.user)
+            cache_profile(request.user.id, data, generation)
+        return Response({"user": with_absolute_avatar(data, request)}, status=200)
 
 
 class ChangePasswordView(APIView):
@@ -328,14 +375,11 @@ class ChangePasswordView(APIView):
         
         # Verify current password
         if not user.check_password(serializer.validated_data["currentPassword"]):
-            return Response(
-                {"error": {"code": 401, "message": "Current password is incorrect"}}, 
-                status=401
-            )
+            return _WRONG_CURRENT_PASSWORD()
 
         # Update password with secure hashing
         user.set_password(serializer.validated_data["newPassword"])
-        user.save()
+        user.save(update_fields=["password"])
 
         # Generate new JWT token since password changed
         token = create_jwt_for_user(user)
@@ -345,16 +389,7 @@ class ChangePasswordView(APIView):
         )
         
         # Update authentication cookie with new token
-        response.set_cookie(
-            AUTH_COOKIE_NAME,
-            token,
-            httponly=True,
-            samesite="Strict",
-            secure=COOKIE_SECURE_SETTING,
-            max_age=AUTH_COOKIE_AGE,
-            path="/",
-        )
-        return response
+        return _set_auth_cookie(response, token)
 
 
 class DeleteAccountView(APIView):
@@ -389,10 +424,7 @@ class DeleteAccountView(APIView):
         
         # Verify current password for security
         if not user.check_password(serializer.validated_data["currentPassword"]):
-            return Response(
-                {"error": {"code": 401, "message": "Current password is incorrect"}}, 
-                status=401
-            )
+            return _WRONG_CURRENT_PASSWORD()
 
         # Permanently delete user account and related data
         user.delete()
@@ -429,13 +461,18 @@ class ProfilePhotoView(APIView):
 
     def post(self, request):
         """
-        Upload and process new profile photo.
+        Accept a new profile photo and queue it for processing.
+        
+        The upload is validated here, stored as-is under avatars/tmp/ and
+        resized by process_avatar_task on the media queue, so the request
+        only costs the upload itself.
         
         Args:
             request: HTTP request with multipart form data containing image
             
         Returns:
-            Response: 200 OK with updated user profile data
+            Response: 202 Accepted with the current profile data and
+            avatarStatus "processing"; avatarUrl updates once the task is done
             
         Example Request:
             POST /api/auth/profile/photo
@@ -447,26 +484,14 @@ class ProfilePhotoView(APIView):
 
         photo = serializer.validated_data["photo"]
         
-        # Process image (resize, optimize, etc.)
-        processed = process_avatar(photo)
-
-        # Get or create user profile
-        profile, _ = UserProfile.objects.get_or_create(user=request.user)
-        
-        # Delete old avatar file if exists
-        if profile.avatar:
-            try: 
-                profile.avatar.delete(save=False)
-            except Exception:
-                # Log error but continue with new upload
-                pass
-
-        # Save new avatar
-        profile.avatar.save(processed.name, processed, save=True)
+        # Park the raw upload where the worker can read it
+        tmp_path = default_storage.save(
+            f"avatars/tmp/{request.user.id}-{uuid.uuid4().hex}", photo
+        )
+        process_avatar_task.delay(request.user.id, tmp_path)
 
-        # Return updated user data
-        data = ProfileSerializer(request.user, context={"request": request}).data
-        return Response({"user": data}, status=200)
+        data = serialize_profile(request.user, request)
+        return Response({"user": data, "avatarStatus": "processing"}, status=202)
 
     def delete(self, request):
         """
@@ -480,13 +505,11 @@ class ProfilePhotoView(APIView):
         """
         profile = getattr(request.user, "profile", None)
         if profile and profile.avatar:
-            try: 
-                profile.avatar.delete(save=False)
-            except Exception:
-                # Log error but continue with removal
-                pass
+            old_path = profile.avatar.name
             profile.avatar = None
             profile.save(update_fields=["avatar"])
+            # Storage delete happens on the media worker
+            delete_avatar_file.delay(old_path)
         return Response(status=204)
 
 
@@ -533,14 +556,15 @@ class ProfileNameView(APIView):
         serializer.is_valid(raise_exception=True)
         
         # Update user name fields
-        for field in ("first_name", "last_name"):
-            if field in serializer.validated_data:
-                setattr(request.user, field, serializer.validated_data[field])
+        changed = [f for f in ("first_name", "last_name") if f in serializer.validated_data]
+        for field in changed:
+            setattr(request.user, field, serializer.validated_data[field])
                 
-        request.user.save()
+        # Write only the submitted columns (empty list = no query)
+        request.user.save(update_fields=changed)
         
         # Return updated user data
-        data = ProfileSerializer(request.user, context={"request": request}).data
+        data = serialize_profile(request.user, request)
         return Response({"user": data}, status=200)
 
 
@@ -0,0 +1,35 @@
+"""
+Custom model fields for the VulnScan scanning application.
+"""
+
+from django.db import models
+
+
+class PgEnumField(models.CharField):
+    """
+    CharField stored as a native PostgreSQL ENUM type.
+
+    Values are compared and returned as plain strings, but PostgreSQL keeps
+    each one as a 4-byte reference into the type's label list instead of a
+    varchar. The type itself is created by a migration (CREATE TYPE ... AS
+    ENUM); its labels must match the field's choices.
+
+    Other database backends get the regular varchar column.
+
+    Args:
+        enum_type (str): Name of the PostgreSQL ENUM type
+    """
+
+    def __init__(self, *args, enum_type, **kwargs):
+        self.enum_type = enum_type
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs["enum_type"] = self.enum_type
+        return name, path, args, kwargs
+
+    def db_type(self, connection):
+        if connection.vendor == "postgresql":
+            return self.enum_type
+        return super().db_type(connection)
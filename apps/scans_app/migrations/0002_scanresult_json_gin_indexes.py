@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-14 13:03
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction; it avoids
+    # holding a write lock on scans_app_scanresult while the GIN index builds
+    atomic = False
+
+    dependencies = [
+        ('scans_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='note',
+            options={'ordering': ['-created_at'], 'verbose_name': 'Vulnerability Note', 'verbose_name_plural': 'Vulnerability Notes'},
+        ),
+        migrations.AlterModelOptions(
+            name='report',
+            options={'ordering': ['-generated_at'], 'verbose_name': 'Scan Report', 'verbose_name_plural': 'Scan Reports'},
+        ),
+        migrations.AlterModelOptions(
+            name='scan',
+            options={'ordering': ['-created_at'], 'verbose_name': 'Vulnerability Scan', 'verbose_name_plural': 'Vulnerability Scans'},
+        ),
+        migrations.AlterModelOptions(
+            name='vulnerability',
+            options={'ordering': ['-severity', 'name'], 'verbose_name': 'Vulnerability', 'verbose_name_plural': 'Vulnerabilities'},
+        ),
+        AddIndexConcurrently(
+            model_name='scanresult',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['open_ports'], name='scanresult_ports_gin', opclasses=['jsonb_path_ops']),
+        ),
+        AddIndexConcurrently(
+            model_name='scanresult',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['http_info'], name='scanresult_http_gin', opclasses=['jsonb_path_ops']),
+        ),
+        AddIndexConcurrently(
+            model_name='scanresult',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tls_info'], name='scanresult_tls_gin', opclasses=['jsonb_path_ops']),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-14 13:03
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    # Built CONCURRENTLY (outside a transaction) so inserts into
+    # scans_app_vulnerability aren't blocked during the build
+    atomic = False
+
+    dependencies = [
+        ('scans_app', '0002_scanresult_json_gin_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='vulnerability',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['reference_links'], name='vuln_refs_gin'),
+        ),
+    ]
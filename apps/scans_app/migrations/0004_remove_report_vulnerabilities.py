@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-14 13:04
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scans_app', '0003_vulnerability_refs_gin'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='report',
+            name='vulnerabilities',
+        ),
+    ]
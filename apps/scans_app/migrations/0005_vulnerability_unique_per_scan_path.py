@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-14 13:06
+
+from django.db import migrations, models
+
+
+# Earlier scans may hold duplicate (scan, name, path) findings. Keep the
+# oldest row of each group, moving notes from the others onto it.
+_DUPLICATES = """
+    SELECT id, MIN(id) OVER (PARTITION BY scan_id, name, path) AS keep_id
+    FROM scans_app_vulnerability
+"""
+
+MERGE_DUPLICATES = f"""
+    UPDATE scans_app_note n SET vuln_id = d.keep_id
+    FROM ({_DUPLICATES}) d
+    WHERE n.vuln_id = d.id AND d.id <> d.keep_id;
+
+    DELETE FROM scans_app_vulnerability v
+    USING ({_DUPLICATES}) d
+    WHERE v.id = d.id AND d.id <> d.keep_id;
+"""
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scans_app', '0004_remove_report_vulnerabilities'),
+    ]
+
+    operations = [
+        migrations.RunSQL(MERGE_DUPLICATES, migrations.RunSQL.noop),
+        migrations.AddConstraint(
+            model_name='vulnerability',
+            constraint=models.UniqueConstraint(fields=('scan', 'name', 'path'), name='uniq_vuln_per_scan_path', nulls_distinct=False),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-14 13:06
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CONCURRENTLY so scan creation/progress updates aren't blocked
+    atomic = False
+
+    dependencies = [
+        ('scans_app', '0005_vulnerability_unique_per_scan_path'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='scan',
+            index=models.Index(condition=models.Q(('status__in', ['queued', 'running'])), fields=['status'], name='scan_active_ix'),
+        ),
+    ]
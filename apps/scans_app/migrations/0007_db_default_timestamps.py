@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-14 13:07
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scans_app', '0006_scan_active_partial_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='note',
+            name='created_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='report',
+            name='generated_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='scan',
+            name='created_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='scanresult',
+            name='created_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='vulnerability',
+            name='created_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+    ]
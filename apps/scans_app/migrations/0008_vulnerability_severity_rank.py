@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-14 13:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scans_app', '0007_db_default_timestamps'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='vulnerability',
+            options={'ordering': ['-severity_rank', 'name'], 'verbose_name': 'Vulnerability', 'verbose_name_plural': 'Vulnerabilities'},
+        ),
+        migrations.AddField(
+            model_name='vulnerability',
+            name='severity_rank',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(severity='info', then=models.Value(0)), models.When(severity='low', then=models.Value(1)), models.When(severity='medium', then=models.Value(2)), models.When(severity='high', then=models.Value(3)), models.When(severity='critical', then=models.Value(4)), default=models.Value(0)), output_field=models.SmallIntegerField()),
+        ),
+        migrations.AddIndex(
+            model_name='vulnerability',
+            index=models.Index(fields=['scan', 'severity_rank'], name='vuln_scan_rank_ix'),
+        ),
+    ]
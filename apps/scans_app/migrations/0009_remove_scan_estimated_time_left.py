@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-14 13:08
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scans_app', '0008_vulnerability_severity_rank'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='scan',
+            name='estimated_time_left',
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Leave 20% free space in each scans_app_scan heap page so progress ticks
+# (UPDATE of the unindexed progress column) can be HOT updates: the new row
+# version stays on the same page and no index entries are added.
+#
+# Only pages written from now on honour the setting. Existing rows are not
+# rewritten here (VACUUM FULL would lock the table); run
+# `VACUUM FULL scans_app_scan` in a maintenance window if needed.
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scans_app', '0009_remove_scan_estimated_time_left'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="ALTER TABLE scans_app_scan SET (fillfactor = 80);",
+            reverse_sql="ALTER TABLE scans_app_scan RESET (fillfactor);",
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Store Vulnerability.severity and Vulnerability.status as native PostgreSQL
+# ENUM types instead of varchar.
+#
+# PostgreSQL can't change the type of a column that a generated column
+# reads, so severity_rank (and its index) is dropped around the severity
+# change and recreated afterwards, recomputing it for every row. Values
+# outside the choices would fail the cast and are normalized first.
+
+import apps.scans_app.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scans_app', '0010_scan_fillfactor'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=[
+                "UPDATE scans_app_vulnerability SET severity = 'info' "
+                "WHERE lower(severity) NOT IN ('info', 'low', 'medium', 'high', 'critical');",
+                "UPDATE scans_app_vulnerability SET severity = lower(severity) WHERE severity <> lower(severity);",
+                "UPDATE scans_app_vulnerability SET status = 'new' "
+                "WHERE status NOT IN ('new', 'acknowledged', 'fixed');",
+            ],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            sql=[
+                "CREATE TYPE vuln_severity AS ENUM ('info', 'low', 'medium', 'high', 'critical');",
+                "CREATE TYPE vuln_status AS ENUM ('new', 'acknowledged', 'fixed');",
+            ],
+            reverse_sql=[
+                "DROP TYPE vuln_status;",
+                "DROP TYPE vuln_severity;",
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='vulnerability',
+            name='vuln_scan_rank_ix',
+        ),
+        migrations.RemoveField(
+            model_name='vulnerability',
+            name='severity_rank',
+        ),
+        migrations.AlterField(
+            model_name='vulnerability',
+            name='severity',
+            field=apps.scans_app.fields.PgEnumField(choices=[('info', 'Info'), ('low', 'Low'), ('medium', 'Medium'), ('high', 'High'), ('critical', 'Critical')], enum_type='vuln_severity', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='vulnerability',
+            name='status',
+            field=apps.scans_app.fields.PgEnumField(choices=[('new', 'New'), ('acknowledged', 'Acknowledged'), ('fixed', 'Fixed')], default='new', enum_type='vuln_status', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='vulnerability',
+            name='severity_rank',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(severity='info', then=models.Value(0)), models.When(severity='low', then=models.Value(1)), models.When(severity='medium', then=models.Value(2)), models.When(severity='high', then=models.Value(3)), models.When(severity='critical', then=models.Value(4)), default=models.Value(0)), output_field=models.SmallIntegerField()),
+        ),
+        migrations.AddIndex(
+            model_name='vulnerability',
+            index=models.Index(fields=['scan', 'severity_rank'], name='vuln_scan_rank_ix'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-14 13:10
+
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Build the covering index before dropping the one it replaces, both
+    # CONCURRENTLY so scan completion isn't blocked
+    atomic = False
+
+    dependencies = [
+        ('scans_app', '0011_vulnerability_enum_types'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='vulnerability',
+            index=models.Index(fields=['scan', 'severity_rank'], include=('severity', 'id'), name='vuln_scan_sev_inc'),
+        ),
+        RemoveIndexConcurrently(
+            model_name='vulnerability',
+            name='vuln_scan_rank_ix',
+        ),
+    ]
@@ -0,0 +1,23 @@
+# TOAST raw_output with lz4 instead of pglz (PostgreSQL 14+, server built
+# with lz4 as Neon's is). Raw scanner dumps are large; lz4 decompresses
+# them several times faster when ?raw=1 is requested.
+#
+# Only values written from now on use lz4. Existing rows keep pglz and stay
+# readable; rewrite them in a maintenance window if needed with
+# `UPDATE scans_app_scanresult SET raw_output = raw_output || '{}'`.
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scans_app', '0012_vulnerability_covering_severity_index'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="ALTER TABLE scans_app_scanresult ALTER COLUMN raw_output SET COMPRESSION lz4;",
+            reverse_sql="ALTER TABLE scans_app_scanresult ALTER COLUMN raw_output SET COMPRESSION DEFAULT;",
+        ),
+    ]
@@ -15,15 +15,20 @@ Architecture:
 
 PostgreSQL Features Used:
 - JSONB: For schemaless storage of scan results and technical data
-- ArrayField: For storing lists of references and vulnerability IDs
+- ArrayField: For storing lists of reference URLs
 - Foreign Keys: For maintaining relational integrity with CASCADE operations
 - DateTimeField: For audit trails and temporal analysis
 """
 
 from django.db import models
+from django.db.models.functions import Now
 from django.conf import settings
+from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+
+from .fields import PgEnumField
 
 
 class Scan(models.Model):
@@ -63,22 +68,46 @@ class Scan(models.Model):
     )
     
     # Timestamps for tracking scan lifecycle
-    created_at = models.DateTimeField(auto_now_add=True)   # DEFAULT NOW()
+    created_at = models.DateTimeField(db_default=Now(), editable=False)   # DEFAULT NOW()
     started_at = models.DateTimeField(null=True, blank=True)
     finished_at = models.DateTimeField(null=True, blank=True)
-    
-    # Human-readable time estimate for ongoing scans
-    estimated_time_left = models.CharField(max_length=50, null=True, blank=True)
+
 
     def __str__(self):
         """Human-readable string representation for admin interface."""
         return f"[{self.id}] {self.target} ({self.mode}) - {self.status}"
 
+    @property
+    def estimated_time_left(self):
+        """
+        Human-readable time estimate for ongoing scans (e.g. "2m30s").
+
+        Extrapolated from progress and started_at instead of being stored,
+        so progress ticks only write the progress column.
+
+        Returns:
+            str or None: Remaining time, or None unless the scan is running
+        """
+        if self.status != "running" or not self.started_at or not self.progress:
+            return None
+        elapsed = (timezone.now() - self.started_at).total_seconds()
+        remaining = int(elapsed * (100 - self.progress) / self.progress)
+        return f"{remaining // 60}m{remaining % 60:02d}s"
+
     class Meta:
         """Metadata options for Scan model."""
         verbose_name = "Vulnerability Scan"
         verbose_name_plural = "Vulnerability Scans"
         ordering = ['-created_at']  # Most recent scans first
+        # Partial index over in-flight scans only; finished ones (the vast
+        # majority) stay out of it, so it remains small and cache-resident
+        indexes = [
+            models.Index(
+                fields=['status'],
+                name='scan_active_ix',
+                condition=models.Q(status__in=['queued', 'running']),
+            ),
+        ]
 
 
 class ScanResult(models.Model):
@@ -106,13 +135,23 @@ class ScanResult(models.Model):
     raw_output = models.JSONField(default=dict)   # optional raw results / debug
     
     # Timestamps for tracking when results were created and updated
-    created_at = models.DateTimeField(auto_now_add=True)  # DEFAULT NOW()
+    created_at = models.DateTimeField(db_default=Now(), editable=False)  # DEFAULT NOW()
     updated_at = models.DateTimeField(auto_now=True)      # trigger equivalent
 
     def __str__(self):
         """Human-readable string representation."""
         return f"Results for Scan #{self.scan_id}"
 
+    class Meta:
+        """Metadata options for ScanResult model."""
+        # jsonb_path_ops GIN indexes: smaller than the default opclass and
+        # only serve containment (@>), e.g. open_ports @> '[{"port": 22}]'
+        indexes = [
+            GinIndex(fields=['open_ports'], name='scanresult_ports_gin', opclasses=['jsonb_path_ops']),
+            GinIndex(fields=['http_info'], name='scanresult_http_gin', opclasses=['jsonb_path_ops']),
+            GinIndex(fields=['tls_info'], name='scanresult_tls_gin', opclasses=['jsonb_path_ops']),
+        ]
+
 
 class Vulnerability(models.Model):
     """
@@ -140,7 +179,22 @@ class Vulnerability(models.Model):
     scan = models.ForeignKey(Scan, on_delete=models.CASCADE, related_name="vulnerabilities")
     
     # Criticality level of the vulnerability for prioritization
-    severity = models.CharField(max_length=20, choices=SEVERITY_CHOICES)
+    # (PostgreSQL ENUM vuln_severity)
+    severity = PgEnumField(max_length=20, choices=SEVERITY_CHOICES, enum_type="vuln_severity")
+
+    # Numeric severity (info=0 … critical=4) for semantic ordering; computed
+    # and stored by PostgreSQL, so bulk_create/COPY inserts get it too
+    severity_rank = models.GeneratedField(
+        expression=models.Case(
+            *[
+                models.When(severity=value, then=models.Value(rank))
+                for rank, (value, _label) in enumerate(SEVERITY_CHOICES)
+            ],
+            default=models.Value(0),
+        ),
+        output_field=models.SmallIntegerField(),
+        db_persist=True,
+    )
     
     # Vulnerability name or CVE identifier
     name = models.CharField(max_length=255)
@@ -166,13 +220,14 @@ class Vulnerability(models.Model):
     )
     
     # Current status in vulnerability management workflow
-    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='new')
+    # (PostgreSQL ENUM vuln_status)
+    status = PgEnumField(max_length=20, choices=STATUS_CHOICES, default='new', enum_type="vuln_status")
     
     # Technical evidence or proof of the vulnerability
     evidence = models.TextField(null=True, blank=True)
     
     # Timestamp when vulnerability was recorded
-    created_at = models.DateTimeField(auto_now_add=True)  # DEFAULT NOW()
+    created_at = models.DateTimeField(db_default=Now(), editable=False)  # DEFAULT NOW()
 
     def __str__(self):
         """Human-readable string representation."""
@@ -182,7 +237,27 @@ class Vulnerability(models.Model):
         """Metadata options for Vulnerability model."""
         verbose_name = "Vulnerability"
         verbose_name_plural = "Vulnerabilities"
-        ordering = ['-severity', 'name']  # Sort by severity then name
+        ordering = ['-severity_rank', 'name']  # Most severe first, then by name
+        # array_ops GIN index for reference_links @> / && lookups
+        indexes = [
+            GinIndex(fields=['reference_links'], name='vuln_refs_gin'),
+            # Covering index: per-scan severity counts (run_scan_task's
+            # GROUP BY severity, ordered listings) are index-only scans
+            models.Index(
+                fields=['scan', 'severity_rank'],
+                include=['severity', 'id'],
+                name='vuln_scan_sev_inc',
+            ),
+        ]
+        # One finding per (scan, name, path); lets run_scan_task upsert.
+        # NULL paths compare equal (PostgreSQL 15+ NULLS NOT DISTINCT)
+        constraints = [
+            models.UniqueConstraint(
+                fields=['scan', 'name', 'path'],
+                name='uniq_vuln_per_scan_path',
+                nulls_distinct=False,
+            ),
+        ]
 
 
 class Report(models.Model):
@@ -190,8 +265,8 @@ class Report(models.Model):
     Aggregated scan results for presentation and export.
     
     Provides summarized information about a scan session suitable for
-    reports, dashboards, and external sharing. Includes statistics
-    and references to specific vulnerabilities.
+    reports, dashboards, and external sharing. Includes statistics;
+    the vulnerabilities themselves are reached through the scan.
     """
     
     # One-to-one relationship with Scan - each scan has one report
@@ -208,19 +283,14 @@ class Report(models.Model):
     # Total scan duration in human-readable format
     duration = models.CharField(max_length=50, null=True, blank=True)
     
-    # Array of vulnerability IDs included in this report
-    # INT[] in SQL → ArrayField(IntegerField)
-    vulnerabilities = ArrayField(
-        base_field=models.IntegerField(),
-        default=list,
-        blank=True,
-    )
+    # Vulnerability IDs are not stored here; they are read through
+    # scan.vulnerabilities (see ReportSerializer.get_vulnerabilities)
     
     # URL or path to downloadable report file (PDF, etc.)
     download_link = models.CharField(max_length=255, null=True, blank=True)
     
     # Timestamp when report was generated
-    generated_at = models.DateTimeField(auto_now_add=True)  # DEFAULT NOW()
+    generated_at = models.DateTimeField(db_default=Now(), editable=False)  # DEFAULT NOW()
 
     def __str__(self):
         """Human-readable string representation."""
@@ -252,7 +322,7 @@ class Note(models.Model):
     content = models.TextField()
     
     # Timestamp when note was created
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)  # DEFAULT NOW()
 
     def __str__(self):
         """Human-readable string representation."""
@@ -278,7 +348,7 @@ Vulnerability (1) ───── (N) Note
    │ (N)
    │  
    ▼
-Report (includes vulnerability IDs)
+Report (statistics; vulnerability IDs derived via Scan)
 
 Key Design Decisions:
 1. JSONB fields in ScanResult allow flexible storage of varying scan data
@@ -292,6 +362,8 @@ Performance Considerations:
 - JSONB fields support efficient querying of nested data
 - ArrayField provides better performance than many-to-many for simple lists
 - DateTime fields with timezone support for accurate timestamping
+- Creation timestamps are column defaults (db_default=Now()): INSERTs and
+  COPY leave them out and PostgreSQL returns the value
 
 Migration Safety:
 - No changes to existing field definitions
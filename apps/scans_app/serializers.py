@@ -19,6 +19,7 @@ Key Features:
 - Support for PostgreSQL JSONB and ArrayField types
 """
 
+from django.db.models import Prefetch
 from rest_framework import serializers
 from .models import Scan, ScanResult, Vulnerability, Report
 
@@ -35,14 +36,32 @@ class ScanResultSerializer(serializers.ModelSerializer):
     - open_ports: JSON array of discovered open ports with service details
     - http_info: JSON object with HTTP service information and headers
     - tls_info: JSON object with TLS/SSL certificate details
-    - raw_output: JSON object with complete raw scanning tool output
     - created_at: Timestamp when results were first created
     - updated_at: Timestamp when results were last updated
+
+    raw_output is left out (see ScanResultRawSerializer): it is the largest
+    column and is TOASTed, so querysets feeding this serializer should
+    .defer("raw_output").
     """
     
     class Meta:
         model = ScanResult
-        fields = ["open_ports", "http_info", "tls_info", "raw_output", "created_at", "updated_at"]
+        fields = ["open_ports", "http_info", "tls_info", "created_at", "updated_at"]
+
+
+class ScanResultRawSerializer(ScanResultSerializer):
+    """
+    ScanResultSerializer plus the complete raw scanning tool output.
+
+    Only used when a client explicitly asks for it (?raw=1).
+
+    Fields:
+    - All ScanResultSerializer fields
+    - raw_output: JSON object with complete raw scanning tool output
+    """
+
+    class Meta(ScanResultSerializer.Meta):
+        fields = ScanResultSerializer.Meta.fields + ["raw_output"]
 
 
 class VulnerabilitySerializer(serializers.ModelSerializer):
@@ -88,16 +107,23 @@ class ReportSerializer(serializers.ModelSerializer):
     - low: Number of low severity vulnerabilities
     - info: Number of informational findings
     - duration: Total scan duration in human-readable format
-    - vulnerabilities: Array of vulnerability IDs included in the report
+    - vulnerabilities: Array of vulnerability IDs, read from the scan's
+      findings (uses the scan's prefetched vulnerabilities when present)
     - download_link: URL or path to downloadable report file
     - generated_at: Timestamp when report was generated
     """
     
+    vulnerabilities = serializers.SerializerMethodField()
+
     class Meta:
         model = Report
         fields = ["total", "critical", "high", "medium", "low", "info", "duration", 
                  "vulnerabilities", "download_link", "generated_at"]
 
+    def get_vulnerabilities(self, obj):
+        """IDs of the scan's findings; .all() reuses a prefetch if present."""
+        return [vuln.id for vuln in obj.scan.vulnerabilities.all()]
+
 
 class ScanSerializer(serializers.ModelSerializer):
     """
@@ -115,8 +141,12 @@ class ScanSerializer(serializers.ModelSerializer):
     Fields:
     - Basic scan metadata: id, target, mode, status, progress, timestamps
     - Nested objects: result, vulnerabilities, report
-    - Progress tracking: progress, estimated_time_left
+    - Progress tracking: progress, estimated_time_left (derived, read-only)
     - Timing information: created_at, started_at, finished_at
+
+    Querysets feeding this serializer must go through setup_eager_loading();
+    otherwise every scan costs three extra queries (result, report and
+    vulnerabilities).
     """
     
     # Nested serializers for related objects
@@ -132,6 +162,26 @@ class ScanSerializer(serializers.ModelSerializer):
             "result", "vulnerabilities", "report",
         ]
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """
+        Fetch the nested relations this serializer reads in bulk.
+
+        Args:
+            queryset (QuerySet): Scan queryset feeding this serializer
+
+        Returns:
+            QuerySet: Queryset joining result/report (without raw_output)
+            and prefetching the vulnerabilities (one IN query, serialized
+            columns only)
+        """
+        vulns = Vulnerability.objects.only("scan", *VulnerabilitySerializer.Meta.fields)
+        return (
+            queryset.select_related("result", "report")
+            .defer("result__raw_output")
+            .prefetch_related(Prefetch("vulnerabilities", queryset=vulns))
+        )
+
 
 class ScanCreateSerializer(serializers.ModelSerializer):
     """
@@ -166,6 +216,7 @@ Serialization Patterns:
 
 2. Nested Serializers:
    - ScanResultSerializer: One-to-one relationship with Scan
+     (ScanResultRawSerializer adds raw_output on request)
    - VulnerabilitySerializer: One-to-many relationship with Scan  
    - ReportSerializer: One-to-one relationship with Scan
 
@@ -176,7 +227,8 @@ Serialization Patterns:
 
 Performance Considerations:
 - Nested serializers can cause N+1 query problems
-- Consider using select_related and prefetch_related in views
+- ScanSerializer.setup_eager_loading() applies the select_related and
+  prefetch_related calls its nested fields need
 - Use specific serializers for different API endpoints
 - Limit nested depth for large result sets
 
@@ -1,20 +1,116 @@
-import time
 from django.utils import timezone
-from django.db import transaction
-from .models import Scan, ScanResult, Vulnerability, Report
-from apps.scans_app.utils.scanner import run_scan
+from django.db import connection, transaction
+from django.db.models import Count
+from .models import Note, Scan, ScanResult, Vulnerability, Report
+from apps.scans_app.utils import progress
+from apps.scans_app.utils.scanner import ScanCanceled, run_scan
 from celery import shared_task  # type: ignore[reportMissingImports]
 
-def _tick_progress(scan: Scan, step: int, total_steps: int):
-    scan.refresh_from_db()
-    if scan.status == "canceled":
-        return False
-    pct = min(99, int(step / total_steps * 100))
-    remaining_steps = max(0, total_steps - step)
-    scan.progress = pct
-    scan.estimated_time_left = f"{remaining_steps // 2}m"
-    scan.save(update_fields=["progress", "estimated_time_left"])
-    return True
+def _tick_progress(scan: Scan, pct: int):
+    """
+    Progress callback for run_scan; returns False once the scan is canceled.
+    """
+    pct = min(99, pct)
+    if progress.publish(scan.id, pct):
+        # Progress lives in Redis; only the cancellation probe hits the DB
+        return not Scan.objects.filter(id=scan.id, status="canceled").exists()
+    # One UPDATE by PK; it matches nothing once the scan has been canceled,
+    # so it also serves as the cancellation check
+    updated = (
+        Scan.objects.filter(id=scan.id)
+        .exclude(status="canceled")
+        .update(progress=pct)
+    )
+    return updated == 1
+
+# Above this many findings, rows are streamed with COPY instead of INSERT
+COPY_THRESHOLD = 1000
+
+# Labels of the vuln_severity ENUM; anything else is stored as "info"
+_SEVERITIES = frozenset(value for value, _label in Vulnerability.SEVERITY_CHOICES)
+
+def _severity(finding):
+    severity = (finding.get("severity") or "info").lower()
+    return severity if severity in _SEVERITIES else "info"
+
+# Columns overwritten when a rerun upserts the scan's Report
+_REPORT_FIELDS = ["total", "critical", "high", "medium", "low", "info", "duration"]
+
+# Columns refreshed when a finding already exists for (scan, name, path)
+_UPSERT_FIELDS = ["severity", "description", "impact", "remediation", "reference_links"]
+
+def _clear_vulnerabilities(scan_id, keep=()):
+    """
+    Delete a scan's findings (and their notes) other than `keep`.
+
+    The ORM delete() first SELECTs every child PK to run the Note cascade
+    in Python. Nothing listens to these models' delete signals, so plain
+    SQL is equivalent. Note.vuln's CASCADE exists only in the ORM; the
+    database constraint doesn't cascade, so the notes are removed first.
+
+    Args:
+        scan_id (int): Scan whose findings are replaced
+        keep (list[int]): IDs of the findings reported by this run
+    """
+    qn = connection.ops.quote_name
+    notes = qn(Note._meta.db_table)
+    vulns = qn(Vulnerability._meta.db_table)
+    stale = f"SELECT id FROM {vulns} WHERE scan_id = %s AND id <> ALL(%s)"
+    with connection.cursor() as c:
+        c.execute(f"DELETE FROM {notes} WHERE vuln_id IN ({stale})", [scan_id, list(keep)])
+        c.execute(f"DELETE FROM {vulns} WHERE id IN ({stale})", [scan_id, list(keep)])
+
+def _copy_vulnerabilities(objs):
+    """
+    Insert unsaved Vulnerability rows with PostgreSQL COPY FROM STDIN.
+
+    COPY skips per-statement parsing, which dominates bulk_create on very
+    large batches. COPY can't return generated keys, so the ids are
+    reserved from the table's sequence first and written explicitly.
+
+    Args:
+        objs (list[Vulnerability]): Unsaved instances; ids are set in place
+
+    Returns:
+        list[Vulnerability]: `objs`, now saved, or None when the connection
+        can't COPY (non-PostgreSQL backend or psycopg2) so the caller
+        falls back to bulk_create
+    """
+    if connection.vendor != "postgresql":
+        return None
+
+    opts = Vulnerability._meta
+    # Columns with a database default (created_at) or computed by the
+    # database (severity_rank) are left to PostgreSQL
+    fields = [
+        f for f in opts.concrete_fields
+        if not f.has_db_default() and not f.generated
+    ]
+    with connection.cursor() as c:
+        if not hasattr(c.cursor, "copy"):  # psycopg 3 only
+            return None
+
+        c.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)",
+            [opts.db_table, opts.pk.column, len(objs)],
+        )
+        for obj, (pk,) in zip(objs, c.fetchall()):
+            obj.pk = pk
+
+        columns = ", ".join(connection.ops.quote_name(f.column) for f in fields)
+        sql = f"COPY {connection.ops.quote_name(opts.db_table)} ({columns}) FROM STDIN"
+        with c.cursor.copy(sql) as copy:
+            for obj in objs:
+                # Lists are encoded as TEXT[] by psycopg (reference_links)
+                copy.write_row([
+                    f.get_db_prep_save(f.pre_save(obj, True), connection)
+                    for f in fields
+                ])
+
+    for obj in objs:
+        obj._state.adding = False
+        obj._state.db = connection.alias
+    return objs
 
 @shared_task(bind=True, name="apps.scans_app.tasks.run_scan_task", max_retries=1)
 def run_scan_task(self, scan_id: int):
@@ -31,75 +127,111 @@ def run_scan_task(self, scan_id: int):
             scan.status = "running"
             scan.started_at = timezone.now()
             scan.progress = 0
-            scan.estimated_time_left = None
-            scan.save(update_fields=["status","started_at","progress","estimated_time_left"])
-
-        total_steps = 20
-        for step in range(1, total_steps + 1):
-            time.sleep(0.5)
-            if not _tick_progress(scan, step, total_steps):
-                scan.finished_at = timezone.now()
-                scan.save(update_fields=["finished_at"])
-                return
+            scan.save(update_fields=["status","started_at","progress"])
 
-        results = run_scan(scan.id, scan.target, scan.mode)
+        try:
+            results = run_scan(
+                scan.id, scan.target, scan.mode,
+                progress_cb=lambda pct: _tick_progress(scan, pct),
+            )
+        except ScanCanceled:
+            scan.finished_at = timezone.now()
+            scan.save(update_fields=["finished_at"])
+            return
 
         with transaction.atomic():
-            ScanResult.objects.update_or_create(
-                scan=scan,
-                defaults=dict(
-                    open_ports=results.get("open_ports", []),
-                    http_info=results.get("http_info", {}),
-                    tls_info=results.get("tls_info", {}),
-                    raw_output=results,
-                ),
+            # Single INSERT ... ON CONFLICT (scan_id) DO UPDATE instead of
+            # update_or_create's SELECT followed by an UPDATE or INSERT
+            ScanResult.objects.bulk_create(
+                [
+                    ScanResult(
+                        scan=scan,
+                        open_ports=results.get("open_ports", []),
+                        http_info=results.get("http_info", {}),
+                        tls_info=results.get("tls_info", {}),
+                        raw_output=results,
+                    )
+                ],
+                update_conflicts=True,
+                unique_fields=["scan"],
+                update_fields=["open_ports", "http_info", "tls_info", "raw_output", "updated_at"],
             )
 
-            scan.vulnerabilities.all().delete()
-
             vulns = results.get("vulnerabilities", []) or []
-            vuln_ids = []
-            severity_count = {"critical":0,"high":0,"medium":0,"low":0,"info":0}
-            for v in vulns:
-                vuln = Vulnerability.objects.create(
-                    scan=scan,
-                    severity=v.get("severity","info"),
-                    name=v.get("name","Unknown"),
-                    path=v.get("path"),
-                    description=v.get("description"),
-                    impact=v.get("impact"),
-                    remediation=v.get("remediation"),
-                    reference_links=v.get("reference_links", []),
+            # One row per (name, path), as uniq_vuln_per_scan_path requires;
+            # a later duplicate in the scanner output wins
+            objs = list({
+                (vuln.name, vuln.path): vuln
+                for vuln in (
+                    Vulnerability(
+                        scan=scan,
+                        severity=_severity(v),
+                        name=v.get("name","Unknown"),
+                        path=v.get("path"),
+                        description=v.get("description"),
+                        impact=v.get("impact"),
+                        remediation=v.get("remediation"),
+                        reference_links=v.get("reference_links", []) or [],
+                    )
+                    for v in vulns
                 )
-                vuln_ids.append(vuln.id)
-                sev = v.get("severity","info")
-                if sev in severity_count:
-                    severity_count[sev] += 1
-
-            Report.objects.update_or_create(
-                scan=scan,
-                defaults=dict(
-                    total=len(vuln_ids),
-                    critical=severity_count["critical"],
-                    high=severity_count["high"],
-                    medium=severity_count["medium"],
-                    low=severity_count["low"],
-                    info=severity_count["info"],
-                    duration="~1m",
-                    vulnerabilities=vuln_ids,
-                ),
+            }.values())
+
+            # COPY can't upsert, so it only serves a first attempt
+            copied = (
+                len(objs) > COPY_THRESHOLD
+                and not Vulnerability.objects.filter(scan=scan).exists()
+                and _copy_vulnerabilities(objs) is not None
+            )
+            if not copied:
+                # Multi-row INSERT ... ON CONFLICT DO UPDATE: findings left
+                # by an earlier attempt keep their id (and notes)
+                Vulnerability.objects.bulk_create(
+                    objs,
+                    batch_size=500,
+                    update_conflicts=True,
+                    unique_fields=["scan", "name", "path"],
+                    update_fields=_UPSERT_FIELDS,
+                )
+                # Drop findings this run no longer reports
+                _clear_vulnerabilities(scan.id, keep=[vuln.pk for vuln in objs])
+
+            # One GROUP BY severity query over the rows just inserted
+            severity_count = dict(
+                Vulnerability.objects.filter(scan=scan)
+                .values_list("severity")
+                .annotate(Count("id"))
+            )
+
+            Report.objects.bulk_create(
+                [
+                    Report(
+                        scan=scan,
+                        total=len(objs),
+                        critical=severity_count.get("critical", 0),
+                        high=severity_count.get("high", 0),
+                        medium=severity_count.get("medium", 0),
+                        low=severity_count.get("low", 0),
+                        info=severity_count.get("info", 0),
+                        duration="~1m",
+                    )
+                ],
+                update_conflicts=True,
+                unique_fields=["scan"],
+                update_fields=_REPORT_FIELDS,
             )
 
             scan.status = "completed"
             scan.progress = 100
             scan.finished_at = timezone.now()
-            scan.estimated_time_left = None
-            scan.save(update_fields=["status","progress","finished_at","estimated_time_left"])
+            scan.save(update_fields=["status","progress","finished_at"])
 
     except Exception:
         with transaction.atomic():
             scan.status = "failed"
             scan.progress = 0
             scan.finished_at = timezone.now()
-            scan.estimated_time_left = None
-            scan.save(update_fields=["status","progress","finished_at","estimated_time_left"])
+            scan.save(update_fields=["status","progress","finished_at"])
+    finally:
+        # Finished, failed or canceled: the database is authoritative again
+        progress.clear(scan.id)
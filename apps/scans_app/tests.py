@@ -1,3 +1,142 @@
-from django.test import TestCase
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.db import Error, connection
+from django.test import SimpleTestCase, TestCase
+
+from apps.scans_app import tasks
+from apps.scans_app.models import Scan
+from apps.scans_app.utils import scanner
+
+
+def _database_available():
+    """True when the configured PostgreSQL server accepts connections."""
+    try:
+        connection.ensure_connection()
+    except (Error, ImproperlyConfigured):
+        return False
+    finally:
+        connection.close()
+    return True
+
+
+_HAVE_DB = _database_available()
+
+
+@skipUnless(_HAVE_DB, "needs a reachable PostgreSQL server (DB_NAME, DB_HOST, ...)")
+class RunScanProgressTests(TestCase):
+    """
+    run_scan with the real task callback, which queries the database.
+
+    Progress must be reported outside the port scan's event loop, where
+    Django refuses ORM calls (SynchronousOnlyOperation).
+    """
+
+    # Without a server the runner must not try to create the test database,
+    # or the whole run errors out before this class is skipped
+    databases = {"default"} if _HAVE_DB else set()
+
+    def setUp(self):
+        user = User.objects.create_user("scanner@example.com", "scanner@example.com", "Secure123!")
+        self.scan = Scan.objects.create(user=user, target="127.0.0.1", mode="quick", status="running")
+
+        # One open port on loopback that never sends a banner
+        self.listener = socket.socket()
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen()
+        self.addCleanup(self.listener.close)
+        self.port = self.listener.getsockname()[1]
+
+        # Force the database path of _tick_progress (no Redis)
+        patcher = mock.patch.object(tasks.progress, "publish", return_value=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _run(self):
+        with mock.patch.object(scanner, "TOP_PORTS_QUICK", [self.port]):
+            return scanner.run_scan(
+                self.scan.id, "127.0.0.1", "quick",
+                progress_cb=lambda pct: tasks._tick_progress(self.scan, pct),
+            )
+
+    def test_progress_written_to_database(self):
+        results = self._run()
+
+        self.assertEqual(
+            [(p["port"], p["state"]) for p in results["open_ports"]],
+            [(self.port, "open")],
+        )
+        self.scan.refresh_from_db()
+        self.assertEqual(self.scan.progress, scanner.PROGRESS_CVES)
+
+    def test_canceled_scan_stops(self):
+        Scan.objects.filter(id=self.scan.id).update(status="canceled")
+
+        with self.assertRaises(scanner.ScanCanceled):
+            self._run()
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    """
+    Answers every request after `delay` seconds; / redirects to /home,
+    so the HEAD and the GET each take two slow round trips.
+    """
+
+    delay = 0.0
+
+    def _respond(self, body=b""):
+        time.sleep(self.delay)
+        if self.path == "/":
+            self.send_response(302)
+            self.send_header("Location", "/home")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command == "GET":
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._respond()
+
+    def do_GET(self):
+        self._respond(b"<title>slow</title>")
+
+    def log_message(self, *args):
+        pass
+
+
+class ProbeWaitTests(SimpleTestCase):
+    """
+    A slow but working target must finish within run_scan's probe wait.
+    """
+
+    def setUp(self):
+        # Step times scaled down; each round trip takes 80% of HTTP_TIMEOUT
+        timeout = 1.0
+        handler = type("Handler", (_SlowHandler,), {"delay": 0.8 * timeout})
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+
+        patcher = mock.patch.object(scanner, "HTTP_TIMEOUT", timeout)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_slow_http_checks_not_cut_off(self):
+        fut = scanner._SCAN_POOL.submit(scanner._http_basic_checks, self.base_url, fallback=False)
+        info = scanner._probe_result(fut, {})
+
+        self.assertEqual(info.get("status"), 200)
+        self.assertEqual(info.get("title"), "slow")
+        self.assertTrue(info.get("robots"))
@@ -68,7 +68,7 @@ GET    /api/scans/{scan_id}/          - Get scan details and progress
 POST   /api/scans/{scan_id}/cancel/   - Cancel ongoing scan
 
 Results & Reporting Routes:
-GET    /api/scans/{scan_id}/result/   - Get detailed technical results
+GET    /api/scans/{scan_id}/result/   - Get detailed technical results (?raw=1 adds raw_output)
 GET    /api/scans/{scan_id}/report/   - Get vulnerability report
 GET    /api/scans/{scan_id}/download/ - Download report (PDF, JSON, CSV)
 
@@ -78,6 +78,16 @@ def set(key: str, value: str, ttl: int = 3600) -> None:
     _memory_store[key] = (value, expires_at)
 
 
+def delete(key: str) -> None:
+    r = get_client()
+    if r:
+        try:
+            r.delete(key)
+        except Exception:
+            pass
+    _memory_store.pop(key, None)
+
+
 # ---------- JSON convenience wrappers ----------
 
 def get_json(key: str) -> Optional[Any]:
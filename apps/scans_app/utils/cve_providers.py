@@ -189,9 +189,11 @@ _VENDOR_MAP = {
 }
 
 
+# All vendor keys in one alternation: a single C-level scan of the product
+# string instead of one substring test per key
+_VENDOR_RE = re.compile("|".join(map(re.escape, _VENDOR_MAP)))
+
+
 def _guess_vendor(product: str) -> Optional[str]:
-    p = (product or "").strip().lower()
-    for k, v in _VENDOR_MAP.items():
-        if k in p:
-            return v
-    return None
+    m = _VENDOR_RE.search((product or "").strip().lower())
+    return _VENDOR_MAP[m.group(0)] if m else None
@@ -0,0 +1,57 @@
+# apps/scans_app/utils/progress.py
+"""
+Live scan progress kept in Redis while a scan runs.
+
+run_scan_task reports progress many times per scan, but clients polling
+GET /api/scans/{id}/ only need the latest value. With Redis available the
+ticks go to vulnscanner:scan_progress:{scan_id} instead of UPDATEs on
+scans_app_scan; the database only gets the final progress on completion.
+
+Without Redis, the per-process memory fallback of utils.cache isn't visible
+to the web workers, so publish() declines and the caller writes the
+database as before.
+"""
+
+from typing import Optional
+
+from . import cache
+
+# Longer than any scan is expected to run; the key is dropped on completion
+PROGRESS_TTL = 60 * 60
+
+
+def _key(scan_id: int) -> str:
+    return cache.cache_key("scan_progress", str(scan_id))
+
+
+def publish(scan_id: int, pct: int) -> bool:
+    """
+    Store the latest progress of a running scan.
+
+    Returns:
+        bool: False when Redis isn't configured; the caller should write
+        Scan.progress itself
+    """
+    if cache.get_client() is None:
+        return False
+    cache.set(_key(scan_id), str(pct), ttl=PROGRESS_TTL)
+    return True
+
+
+def current(scan) -> int:
+    """
+    Return the freshest progress for `scan`: Redis while it runs, else the DB.
+    """
+    if scan.status == "running" and cache.get_client() is not None:
+        raw: Optional[str] = cache.get(_key(scan.id))
+        if raw is not None:
+            try:
+                return int(raw)
+            except ValueError:
+                pass
+    return scan.progress
+
+
+def clear(scan_id: int) -> None:
+    """Drop the live progress once the scan has finished."""
+    cache.delete(_key(scan_id))
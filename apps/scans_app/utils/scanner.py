@@ -10,22 +10,26 @@ Legit lightweight scanner:
 All network activity is read-only & non-intrusive.
 """
 from __future__ import annotations
+import asyncio
+import http.cookiejar
+import ipaddress
 import socket
 import ssl
 import re
-from datetime import datetime, timezone
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, Any, List, Optional, Tuple
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Callable, Dict, Any, List, NamedTuple, Optional, Tuple
 from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from .cve_providers import query_cves_for_product_version
 
 # ---------- Config ----------
 TCP_TIMEOUT = 2.0
+BANNER_TIMEOUT = 1.0
 HTTP_TIMEOUT = 5.0
-MAX_WORKERS = 12
 HTTP_HEADERS = {"User-Agent": "vulnscanner-lite/0.1 (+https://example.com)"}
 
 TOP_PORTS_QUICK = [80, 443, 22, 21, 25, 3306, 445]
@@ -43,7 +47,19 @@ PORT_SERVICE = {
     9200: "elasticsearch", 27017: "mongodb"
 }
 
+# Resolved addresses per hostname: host -> (expires_at, addresses)
+DNS_TTL = 300.0
+DNS_CHECK_TIMEOUT = 0.5  # budget for host_resolves() on the request path
+DNS_MAX_ADDRS = 3  # addresses tried per connect before a port counts as closed
+_DNS_CACHE: Dict[str, Tuple[float, List[str]]] = {}
+
 TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+# Only the start of a page is searched for <title>
+TITLE_SCAN_BYTES = 16 * 1024
+
+# Cookie attributes reported in http_info["cookie_flags"], in output order
+COOKIE_FLAGS = ("HttpOnly", "Secure", "SameSite")
+_COOKIE_FLAG_RE = re.compile(r";\s*(" + "|".join(COOKIE_FLAGS) + r")\b", re.IGNORECASE)
 
 # Basic product/version heuristics
 # Examples:
@@ -73,44 +89,117 @@ def _normalize_target(target: str) -> Tuple[str, str]:
     return t, f"http://{t}"
 
 
-def _tcp_connect(host: str, port: int, timeout: float = TCP_TIMEOUT) -> bool:
-    try:
-        with socket.create_connection((host, port), timeout=timeout):
-            return True
-    except Exception:
-        return False
+def _http_session(verify: bool) -> requests.Session:
+    s = requests.Session()
+    s.headers.update(HTTP_HEADERS)
+    s.verify = verify
+    # The sessions are shared by every scan in the process: never store or
+    # replay cookies, or one target's cookies would reach the next scans
+    s.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=0)
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    return s
+
+
+# Process-wide sessions: HEAD/GET/robots.txt reuse one keep-alive
+# connection per host, and repeat scans of a host can reuse it too. The
+# plain-HTTP fallback has its own session so `verify` never changes on a
+# pool.
+_SESSION = _http_session(verify=True)
+_SESSION_INSECURE = _http_session(verify=False)
+
+# One context for every TLS probe: the CA store is loaded once per process.
+# SSLContext is safe to share between threads.
+_TLS_CTX = ssl.create_default_context()
+
+# Long-lived helper threads for blocking probes that run alongside others,
+# shared by every scan in the process and never shut down. A scan holds at
+# most two at once (HTTPS checks, TLS), so 32 leaves room for threaded
+# Celery workers running scans side by side.
+_SCAN_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix="vs-scan")
+# Longest run_scan waits for a pooled probe, in HTTP_TIMEOUTs. The HTTPS
+# checks run HEAD, GET (+ title read) and the bounded robots.txt wait one
+# after another, each allowed about one HTTP_TIMEOUT; the extra step is
+# headroom so a slow but working target isn't cut off. The TLS probe
+# (DNS_MAX_ADDRS x TCP_TIMEOUT + handshake) fits well within it.
+PROBE_WAIT_STEPS = 4
+
+# host_resolves() lookups from the web process. Kept apart from the scan
+# pools so a slow resolver can only tie up these few threads; threads are
+# only started once a lookup is submitted.
+_DNS_CHECK_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="vs-dns-check")
+
+# robots.txt HEADs are submitted from tasks already running on _SCAN_POOL;
+# a pool of their own means a full _SCAN_POOL can never starve them
+_ROBOTS_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="vs-robots")
+
+
+def _read_title(r: requests.Response) -> Optional[str]:
+    """
+    Find the page title in the first TITLE_SCAN_BYTES of a streamed response.
+
+    The rest of the body is never downloaded or decoded. A body that ends
+    within the window leaves the keep-alive connection reusable.
+    """
+    head = r.raw.read(TITLE_SCAN_BYTES, decode_content=True) or b""
+    if r.raw.read(1, decode_content=True):
+        r.close()  # more body left: drop the connection instead of reading it
+    else:
+        r.raw.release_conn()
+    m = TITLE_RE.search(head.decode(r.encoding or "utf-8", errors="ignore"))
+    return " ".join(m.group(1).split()) if m else None
 
 
-def _banner_grab(host: str, port: int, timeout: float = TCP_TIMEOUT) -> Optional[str]:
+def _cookie_flags(r: requests.Response) -> List[str]:
+    """
+    Attributes from COOKIE_FLAGS set on any of the response's cookies.
+
+    Each Set-Cookie header is checked on its own: requests joins repeated
+    headers with ", ", which is ambiguous since Expires contains a comma.
+    """
+    headers = r.raw.headers if r.raw is not None else None
+    if hasattr(headers, "getlist"):
+        cookies = headers.getlist("Set-Cookie")
+    else:
+        cookies = [r.headers.get("Set-Cookie", "")]
+    found = {m.group(1).lower() for c in cookies for m in _COOKIE_FLAG_RE.finditer(c)}
+    return [f for f in COOKIE_FLAGS if f.lower() in found]
+
+
+def _robots_present(base_url: str) -> Optional[bool]:
+    """
+    HEAD /robots.txt without following redirects; a redirect counts as present.
+    """
     try:
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        s.settimeout(timeout)
-        s.connect((host, port))
-        try:
-            s.sendall(b"\r\n")
-        except Exception:
-            pass
-        data = b""
-        try:
-            data = s.recv(1024)
-        except Exception:
-            pass
-        finally:
-            s.close()
-        if not data:
-            return None
-        return data.decode(errors="ignore").strip()
+        rr = _SESSION.head(base_url.rstrip("/") + "/robots.txt", allow_redirects=False, timeout=HTTP_TIMEOUT)
+        return rr.status_code in (200, 301, 302)
     except Exception:
         return None
 
 
-def _http_session() -> requests.Session:
-    s = requests.Session()
-    s.headers.update(HTTP_HEADERS)
-    return s
+def _plain_http_fallback(base_url: str, out: Dict[str, Any]) -> None:
+    """
+    Fill status/server/title of `out` from plain HTTP after HTTPS failed.
+    """
+    try:
+        http_url = "http://" + base_url.split("://", 1)[1]
+        g = _SESSION_INSECURE.get(http_url, allow_redirects=True, timeout=HTTP_TIMEOUT, stream=True)
+        out["status"] = g.status_code
+        out["server"] = out["server"] or g.headers.get("Server")
+        out["title"] = _read_title(g)
+    except Exception:
+        pass
+
 
+def _http_basic_checks(base_url: str, fallback: bool = True) -> Dict[str, Any]:
+    """
+    HEAD/GET `base_url` for status, headers, title, robots.txt and cookies.
 
-def _http_basic_checks(session: requests.Session, base_url: str) -> Dict[str, Any]:
+    With fallback, a failing https:// URL is retried over plain HTTP
+    (_plain_http_fallback); run_scan's speculative HTTPS check disables it
+    so a target without TLS isn't probed over HTTP twice.
+    """
     out: Dict[str, Any] = {
         "status": None,
         "title": None,
@@ -122,85 +211,65 @@ def _http_basic_checks(session: requests.Session, base_url: str) -> Dict[str, An
         "redirect_chain": []
     }
     try:
-        r = session.head(base_url, allow_redirects=True, timeout=HTTP_TIMEOUT, verify=True)
+        r = _SESSION.head(base_url, allow_redirects=True, timeout=HTTP_TIMEOUT)
         out["status"] = r.status_code
         out["server"] = r.headers.get("Server")
         out["redirect_chain"] = [h.url for h in r.history] if r.history else []
-        out["hsts"] = any(h.lower() == "strict-transport-security" for h in r.headers.keys())
+        out["hsts"] = "Strict-Transport-Security" in r.headers  # CaseInsensitiveDict
         out["csp"] = r.headers.get("Content-Security-Policy")
 
         need_get = (out["status"] is None) or ("text/html" in (r.headers.get("Content-Type", "") or "").lower())
         if need_get:
-            g = session.get(base_url, allow_redirects=True, timeout=HTTP_TIMEOUT, verify=True)
+            # robots.txt presence, checked while the page itself is fetched
+            robots = _ROBOTS_POOL.submit(_robots_present, base_url)
+
+            g = _SESSION.get(base_url, allow_redirects=True, timeout=HTTP_TIMEOUT, stream=True)
             out["status"] = g.status_code
             out["server"] = out["server"] or g.headers.get("Server")
-            html = g.text or ""
-            m = TITLE_RE.search(html)
-            if m:
-                out["title"] = re.sub(r"\s+", " ", m.group(1).strip())
-
-            # robots.txt presence
-            robots_url = base_url.rstrip("/") + "/robots.txt"
+            out["title"] = _read_title(g)
             try:
-                rr = session.get(robots_url, timeout=HTTP_TIMEOUT, verify=True)
-                out["robots"] = (rr.status_code == 200)
-            except Exception:
-                out["robots"] = None
+                out["robots"] = robots.result(timeout=HTTP_TIMEOUT)
+            except FutureTimeout:
+                robots.cancel()  # stays None; a queued HEAD is dropped
 
-            # Set-Cookie flags (crude)
-            set_cookie_headers = g.headers.get("Set-Cookie", "")
-            flags = []
-            if "HttpOnly" in set_cookie_headers:
-                flags.append("HttpOnly")
-            if "Secure" in set_cookie_headers:
-                flags.append("Secure")
-            out["cookie_flags"] = flags
+            out["cookie_flags"] = _cookie_flags(g)
 
     except requests.RequestException:
         # try plain HTTP if HTTPS fails and scheme is https
-        if base_url.startswith("https://"):
-            try:
-                http_url = "http://" + base_url.split("://", 1)[1]
-                g = session.get(http_url, allow_redirects=True, timeout=HTTP_TIMEOUT, verify=False)
-                out["status"] = g.status_code
-                out["server"] = out["server"] or g.headers.get("Server")
-                html = g.text or ""
-                m = TITLE_RE.search(html)
-                if m:
-                    out["title"] = re.sub(r"\s+", " ", m.group(1).strip())
-            except Exception:
-                pass
+        if fallback and base_url.startswith("https://"):
+            _plain_http_fallback(base_url, out)
     except Exception:
         pass
 
     return out
 
 
-def _tls_cert_info(host: str, port: int = 443, timeout: float = TCP_TIMEOUT) -> Optional[Dict[str, Any]]:
+def _tls_cert_info(host: str, port: int = 443, timeout: float = TCP_TIMEOUT, addrs: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
     try:
-        ctx = ssl.create_default_context()
-        with ctx.wrap_socket(socket.socket(socket.AF_INET), server_hostname=host) as s:
-            s.settimeout(timeout)
-            s.connect((host, port))
-            cert = s.getpeercert()
-
-        def _parse_dt(x: Optional[str]) -> Optional[datetime]:
+        # Connect to the pre-resolved addresses; SNI and verification use the name
+        with _connect(addrs or [host], port, timeout) as raw:
+            # Handshake explicitly so its timeout is set here, not inherited
+            with _TLS_CTX.wrap_socket(raw, server_hostname=host, do_handshake_on_connect=False) as s:
+                s.settimeout(timeout)
+                s.do_handshake()
+                cert = s.getpeercert()
+
+        def _parse_ts(x: Optional[str]) -> Optional[float]:
+            # OpenSSL's "%b %d %H:%M:%S %Y GMT", parsed in C
             if not x:
                 return None
             try:
-                return datetime.strptime(x, "%b %d %H:%M:%S %Y %Z").replace(tzinfo=timezone.utc)
-            except Exception:
+                return ssl.cert_time_to_seconds(x)
+            except ValueError:
                 return None
 
-        not_before = _parse_dt(cert.get("notBefore"))
-        not_after = _parse_dt(cert.get("notAfter"))
-        now = datetime.now(timezone.utc)
+        not_after = _parse_ts(cert.get("notAfter"))
 
         days_left = None
         valid = None
-        if not_after:
-            days_left = (not_after - now).days
-            valid = (days_left is not None) and (days_left > 0)
+        if not_after is not None:
+            days_left = int((not_after - time.time()) // 86400)
+            valid = days_left > 0
 
         sans = [v for (_t, v) in cert.get("subjectAltName", ())]
         issuer = cert.get("issuer")
@@ -240,66 +309,231 @@ def _extract_product_version(text: Optional[str]) -> Optional[Tuple[str, Optiona
     return None
 
 
-def _scan_port_worker(host: str, port: int) -> Dict[str, Any]:
-    state = "open" if _tcp_connect(host, port) else "closed"
-    banner = _banner_grab(host, port) if state == "open" else None
-    return {
-        "port": port,
-        "service": PORT_SERVICE.get(port, "unknown"),
-        "state": state,
-        "banner": banner
-    }
+def _lookup(host: str) -> Optional[List[str]]:
+    """
+    Resolve `host` once per DNS_TTL, or return None if it doesn't resolve.
+    Failures are not cached.
+
+    Up to DNS_MAX_ADDRS distinct addresses are kept, IPv4 first (what the
+    scanner used to probe); connects fall back along the list.
+    """
+    now = time.monotonic()
+    hit = _DNS_CACHE.get(host)
+    if hit and hit[0] > now:
+        return hit[1]
+    try:
+        infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+    except (OSError, UnicodeError):
+        return None
+    infos.sort(key=lambda info: info[0] != socket.AF_INET)  # stable
+    addrs = list(dict.fromkeys(info[4][0] for info in infos))[:DNS_MAX_ADDRS]
+    _DNS_CACHE[host] = (now + DNS_TTL, addrs)
+    return addrs
+
+
+def _resolve(host: str) -> List[str]:
+    """
+    Resolve `host` once per DNS_TTL; port probes and the TLS connect then
+    skip getaddrinfo. Falls back to the name itself if resolution fails.
+    """
+    return _lookup(host) or [host]
+
+
+def _connect(addrs: List[str], port: int, timeout: float) -> socket.socket:
+    """
+    Open a TCP connection to the first of `addrs` that accepts one.
+
+    Raises:
+        OSError: From the last address if none of them connect
+    """
+    err: Optional[OSError] = None
+    for addr in addrs:
+        try:
+            return socket.create_connection((addr, port), timeout=timeout)
+        except OSError as exc:
+            err = exc
+    raise err or OSError("no address to connect to")
+
+
+def host_resolves(target: str, timeout: float = DNS_CHECK_TIMEOUT) -> Optional[bool]:
+    """
+    Check that a scan target's host name resolves, spending at most
+    `timeout` seconds. Meant for the view, so a typo is rejected up front
+    instead of reaching a worker.
+
+    Returns:
+        bool or None: True if it resolves (IP addresses and CIDRs always
+        do), False if the resolver says it doesn't, None if that couldn't
+        be verified in time; the scan itself will then find out
+    """
+    host, _ = _normalize_target(target)
+    try:
+        name = urlparse("//" + host).hostname or host  # drop port, [ ] of IPv6
+    except ValueError:
+        return True  # malformed brackets; left to the scanner as before
+    try:
+        ipaddress.ip_network(name, strict=False)
+        return True
+    except ValueError:
+        pass
+    fut = _DNS_CHECK_POOL.submit(_lookup, name)
+    try:
+        return fut.result(timeout=timeout) is not None
+    except FutureTimeout:
+        fut.cancel()  # drops it if still queued behind slow lookups
+        return None
+
+
+class PortResult(NamedTuple):
+    port: int
+    service: str
+    state: str
+    banner: Optional[str]
+
+
+async def _scan_port(addrs: List[str], port: int, service: str) -> PortResult:
+    """
+    Connect to one port and read a banner over the same connection. Each
+    address is tried in turn; the port is closed if none accepts.
+    """
+    for addr in addrs:
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(addr, port), TCP_TIMEOUT)
+            break
+        except (asyncio.TimeoutError, OSError):
+            continue
+    else:
+        return PortResult(port, service, "closed", None)
+
+    banner = None
+    try:
+        writer.write(b"\r\n")
+        await writer.drain()
+        data = await asyncio.wait_for(reader.read(1024), BANNER_TIMEOUT)
+        banner = data.decode(errors="ignore").strip() or None
+    except (asyncio.TimeoutError, OSError):
+        pass
+    finally:
+        writer.close()
+    return PortResult(port, service, "open", banner)
+
+
+async def _scan_ports(addrs: List[str], ports: List[int]) -> List[PortResult]:
+    """
+    Probe every port concurrently on one event loop; total time is about one
+    TCP_TIMEOUT (+ BANNER_TIMEOUT) rather than one per batch of threads.
+    """
+    return await asyncio.gather(*(_scan_port(addrs, p, PORT_SERVICE.get(p, "unknown")) for p in ports))
 
 
 # ---------- Public API (used by tasks.py) ----------
 
-def run_scan(scan_id: int, target: str, mode: str) -> Dict[str, Any]:
+# Progress checkpoints (percent) at the end of each phase
+PROGRESS_PORTS = 60
+PROGRESS_HTTP = 70
+PROGRESS_TLS = 80
+PROGRESS_CVES = 95
+
+
+def _probe_result(fut: Future, default: Any) -> Any:
+    """
+    Result of a pooled probe, or `default` if it isn't done within
+    PROBE_WAIT_STEPS x HTTP_TIMEOUT (the future is then cancelled if it
+    hasn't started).
+    """
+    try:
+        return fut.result(timeout=PROBE_WAIT_STEPS * HTTP_TIMEOUT)
+    except FutureTimeout:
+        fut.cancel()
+        return default
+
+
+class ScanCanceled(Exception):
+    """Raised by run_scan when its progress callback reports a cancellation."""
+
+
+def run_scan(
+    scan_id: int,
+    target: str,
+    mode: str,
+    progress_cb: Optional[Callable[[int], bool]] = None,
+) -> Dict[str, Any]:
     """
     Return dict consumed by tasks.py:
       - open_ports: [ {port, service, state, banner} ]
       - http_info:  {status, title, server, hsts, csp, robots, cookie_flags, redirect_chain}
       - tls_info:   {issuer, subject, sans, valid_from, valid_to, days_left, valid}
       - vulnerabilities: [ {severity, name, path, description, impact, remediation, reference_links} ]
+
+    progress_cb(pct) is called as work completes; returning False stops the
+    scan with ScanCanceled.
     """
+    last_pct = -1
+
+    def report(pct: int) -> None:
+        nonlocal last_pct
+        if progress_cb is None or pct == last_pct:
+            return
+        last_pct = pct
+        if progress_cb(pct) is False:
+            raise ScanCanceled(scan_id)
+
     host, base_url = _normalize_target(target)
+    addrs = _resolve(host)
     ports = TOP_PORTS_QUICK if mode == "quick" else TOP_PORTS_FULL
 
-    # 1) Port scan
-    open_ports: List[Dict[str, Any]] = []
-    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, max(1, len(ports)))) as pool:
-        futures = {pool.submit(_scan_port_worker, host, p): p for p in ports}
-        for fut in as_completed(futures):
-            open_ports.append(fut.result())
+    # HTTPS and TLS only depend on 443, so start them now and let them run
+    # alongside the port scan; results are dropped below if 443 is closed
+    https_base = base_url if base_url.startswith("https://") else "https://" + host
+    https_f = _SCAN_POOL.submit(_http_basic_checks, https_base, fallback=False)
+    tls_f = _SCAN_POOL.submit(_tls_cert_info, host, 443, addrs=addrs)
+
+    # 1) Port scan. Progress is only reported once the loop has returned:
+    # progress_cb uses the ORM, which Django refuses to run inside an event
+    # loop (SynchronousOnlyOperation). The phase lasts about one TCP_TIMEOUT.
+    port_results = asyncio.run(_scan_ports(addrs, ports))
+    open_set = {p.port for p in port_results if p.state == "open"}
+    has_http = 80 in open_set
+    has_https = 443 in open_set
+    if not has_https:
+        # Their results won't be used: drop the probes that haven't started
+        # (running ones end on their own socket timeouts)
+        https_f.cancel()
+        tls_f.cancel()
+    try:
+        report(PROGRESS_PORTS)
+    except ScanCanceled:
+        https_f.cancel()
+        tls_f.cancel()
+        raise
 
     # 2) HTTP checks
     http_info: Dict[str, Any] = {}
     try:
-        has_http = any(p["port"] == 80 and p["state"] == "open" for p in open_ports)
-        has_https = any(p["port"] == 443 and p["state"] == "open" for p in open_ports)
         if has_https:
-            base = base_url if base_url.startswith("https://") else "https://" + host
+            http_info = _probe_result(https_f, {})
+            if http_info and http_info["status"] is None:
+                # HTTPS itself failed: the fallback the speculative call skipped
+                _plain_http_fallback(https_base, http_info)
         elif has_http:
             base = base_url if base_url.startswith("http://") else "http://" + host
-        else:
-            base = None
-
-        if base:
-            with _http_session() as sess:
-                http_info = _http_basic_checks(sess, base)
+            http_info = _http_basic_checks(base)
     except Exception:
         http_info = {}
+    report(PROGRESS_HTTP)
 
     # 3) TLS cert info
-    tls_info = _tls_cert_info(host, 443) if any(p["port"] == 443 and p["state"] == "open" for p in open_ports) else {}
+    tls_info = _probe_result(tls_f, None) if has_https else {}
+    report(PROGRESS_TLS)
 
     # 4) CVE suggestions (best-effort)
     # Collect product/version candidates from banners & server header
     candidates: List[Tuple[str, Optional[str]]] = []
 
     # From port banners
-    for p in open_ports:
-        if p.get("banner"):
-            pv = _extract_product_version(p["banner"])
+    for p in port_results:
+        if p.banner:
+            pv = _extract_product_version(p.banner)
             if pv:
                 candidates.append(pv)
 
@@ -341,8 +575,11 @@ def run_scan(scan_id: int, target: str, mode: str) -> Dict[str, Any]:
                     "reference_links": [f"https://cve.mitre.org/cgi-bin/cvename.cgi?name={cve}"],
                 })
 
+    report(PROGRESS_CVES)
+
     return {
-        "open_ports": open_ports,
+        # Plain dicts for the JSON column
+        "open_ports": [p._asdict() for p in port_results],
         "http_info": http_info,
         "tls_info": tls_info or {},
         "vulnerabilities": vulnerabilities,
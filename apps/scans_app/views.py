@@ -24,29 +24,46 @@ Security Features:
 from urllib.parse import urlparse
 import ipaddress
 from collections import Counter
+from functools import lru_cache
 from datetime import timedelta
 
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
 from django.http import HttpResponse, JsonResponse
 from django.template.loader import render_to_string
-import django.db.models as djm
 from weasyprint import HTML
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
 from rest_framework.decorators import api_view, permission_classes, authentication_classes
+from rest_framework.pagination import LimitOffsetPagination
 
 from .models import Scan, ScanResult, Vulnerability
 from .serializers import (
     ScanCreateSerializer,
     ScanResultSerializer,
+    ScanResultRawSerializer,
     VulnerabilitySerializer,
     ReportSerializer,
 )
 from apps.auth_app.authentication import CookieJWTAuthentication as JWTAuthentication
 from .tasks import run_scan_task
+from .utils import progress
+from .utils.scanner import host_resolves
+
+# Largest page the scan history endpoint serves
+MAX_LIST_LIMIT = 100
+
+
+class ScanListPagination(LimitOffsetPagination):
+    """
+    ?limit=&offset= paging for the scan history (limit 10 by default,
+    clamped to MAX_LIST_LIMIT; negative or zero values fall back to the
+    defaults).
+    """
+    default_limit = 10
+    max_limit = MAX_LIST_LIMIT
 
 
 class AuthenticatedView(APIView):
@@ -61,6 +78,7 @@ class AuthenticatedView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
 
+@lru_cache(maxsize=4096)
 def _is_valid_target(target: str) -> bool:
     """
     Validate scan target format.
@@ -80,34 +98,30 @@ def _is_valid_target(target: str) -> bool:
     if not target or len(target) > 255:
         return False
 
-    # CIDR (contains slash)
-    try:
-        if "/" in target:
-            ipaddress.ip_network(target, strict=False)
-            return True
-    except ValueError:
-        pass
-
-    # IP address
-    try:
-        ipaddress.ip_address(target)
+    # Plain hostname (best-effort); IPv4 addresses/CIDRs and most URLs land
+    # here too, so the common case needs no parsing at all
+    if "." in target and " " not in target:
         return True
-    except ValueError:
-        pass
 
     # URL with scheme + host
     try:
         parsed = urlparse(target)
         if parsed.scheme in ("http", "https") and parsed.netloc:
             return True
-    except Exception:
+    except ValueError:
         pass
 
-    # Plain hostname (best-effort)
-    if "." in target and " " not in target:
+    # Without a dot only IPv6 is left, as an address or (with a slash) CIDR
+    if ":" not in target:
+        return False
+    try:
+        if "/" in target:
+            ipaddress.ip_network(target, strict=False)
+        else:
+            ipaddress.ip_address(target)
         return True
-
-    return False
+    except ValueError:
+        return False
 
 
 def _scan_summary_for_list(scan: Scan):
@@ -137,7 +151,7 @@ def _scan_summary_for_list(scan: Scan):
         }
         base["duration"] = scan.report.duration
     elif scan.status == "running":
-        base["progress"] = scan.progress
+        base["progress"] = progress.current(scan)
     return base
 
 
@@ -151,6 +165,9 @@ def _scan_detail_for_get(scan: Scan):
     Returns:
         dict: Formatted scan details for single view
     """
+    # Running scans report progress through Redis (utils.progress); the
+    # time estimate below is derived from it
+    scan.progress = progress.current(scan)
     return {
         "scanId": f"s_{scan.id}",
         "target": scan.target,
@@ -188,6 +205,9 @@ class ScanListCreateView(AuthenticatedView):
             return Response({"error": {"code": 400, "message": "mode must be 'quick' or 'full'"}}, status=400)
         if not _is_valid_target(target):
             return Response({"error": {"code": 400, "message": "Invalid target URL/IP/CIDR"}}, status=400)
+        # None (not verifiable in time) is let through to the scan
+        if host_resolves(target) is False:
+            return Response({"error": {"code": 400, "message": "Target host could not be resolved"}}, status=400)
 
         scan = Scan.objects.create(
             user=request.user,
@@ -195,7 +215,6 @@ class ScanListCreateView(AuthenticatedView):
             mode=mode,
             status="queued",
             progress=0,
-            created_at=timezone.now(),
         )
 
         # enqueue Celery task
@@ -216,21 +235,30 @@ class ScanListCreateView(AuthenticatedView):
         """
         Retrieve user's scan history.
         
-        Supports pagination and filtering by status and mode.
+        Supports pagination (ScanListPagination) and filtering by status
+        and mode. "count" is the number of scans matching the filters.
         """
-        limit = int(request.query_params.get("limit", 10))
-        offset = int(request.query_params.get("offset", 0))
+        try:
+            for param in ("limit", "offset"):
+                int(request.query_params.get(param, 0))
+        except ValueError:
+            return Response({"error": {"code": 400, "message": "limit and offset must be integers"}}, status=400)
         status_filter = request.query_params.get("status")
         mode_filter = request.query_params.get("mode")
 
-        qs = Scan.objects.filter(user=request.user).order_by("-created_at")
+        # The summary reads scan.report; join it instead of one query per scan
+        qs = Scan.objects.filter(user=request.user).select_related("report").order_by("-created_at")
         if status_filter in {"queued", "running", "completed", "failed", "canceled"}:
             qs = qs.filter(status=status_filter)
         if mode_filter in {"quick", "full"}:
             qs = qs.filter(mode=mode_filter)
 
-        scans = qs[offset : offset + limit]
-        return Response({"scans": [_scan_summary_for_list(s) for s in scans]}, status=200)
+        paginator = ScanListPagination()
+        scans = paginator.paginate_queryset(qs, request, view=self)
+        return Response(
+            {"scans": [_scan_summary_for_list(s) for s in scans], "count": paginator.count},
+            status=200,
+        )
 
 
 class ScanDetailView(AuthenticatedView):
@@ -264,19 +292,16 @@ class ScanCancelView(AuthenticatedView):
         """
         Cancel a scan if it's still running or queued.
         """
-        try:
-            scan = Scan.objects.get(id=scan_id, user=request.user)
-        except Scan.DoesNotExist:
-            return Response({"error": {"code": 404, "message": "Scan not found"}}, status=404)
-
-        if scan.status in ("completed", "failed", "canceled"):
-            # idempotent response
-            return Response({"scanId": f"s_{scan.id}", "status": scan.status}, status=200)
+        # One conditional UPDATE; the worker sees the status on its next tick
+        scans = Scan.objects.filter(id=scan_id, user=request.user)
+        if scans.exclude(status__in=("completed", "failed", "canceled")).update(status="canceled"):
+            return Response({"scanId": f"s_{scan_id}", "status": "canceled"}, status=200)
 
-        scan.status = "canceled"
-        scan.estimated_time_left = None
-        scan.save(update_fields=["status", "estimated_time_left"])
-        return Response({"scanId": f"s_{scan.id}", "status": "canceled"}, status=200)
+        current = scans.values_list("status", flat=True).first()
+        if current is None:
+            return Response({"error": {"code": 404, "message": "Scan not found"}}, status=404)
+        # idempotent response
+        return Response({"scanId": f"s_{scan_id}", "status": current}, status=200)
 
 
 class ScanResultView(AuthenticatedView):
@@ -285,13 +310,20 @@ class ScanResultView(AuthenticatedView):
     
     Provides access to raw scan data including open ports,
     service information, and TLS configuration details.
+    The complete raw tool output is only included with ?raw=1.
     """
     
     def get(self, request, scan_id: int):
         """
         Get detailed technical scan results.
         """
-        scan = get_object_or_404(Scan, id=scan_id, user=request.user)
+        raw = request.query_params.get("raw") == "1"
+        # Result joined in the same query; raw_output (large, TOASTed) is
+        # only read from disk when asked for
+        qs = Scan.objects.select_related("result")
+        if not raw:
+            qs = qs.defer("result__raw_output")
+        scan = get_object_or_404(qs, id=scan_id, user=request.user)
         if scan.status != "completed":
             return Response(
                 {"detail": f"Scan is {scan.status}. Results available after completion."},
@@ -307,7 +339,7 @@ class ScanResultView(AuthenticatedView):
             "target": scan.target,
             "mode": scan.mode,
             "status": scan.status,
-            "result": ScanResultSerializer(result).data,
+            "result": (ScanResultRawSerializer if raw else ScanResultSerializer)(result).data,
         }
         return Response(data, status=status.HTTP_200_OK)
 
@@ -353,81 +385,12 @@ def _pct(n, total):
         return 0
 
 
-
-
-class ScanReportView(AuthenticatedView):
+class ScanReportView(ScanResultView):
     """
     Retrieve detailed technical results from a completed scan.
     
-    Provides access to raw scan data including open ports,
-    service information, and TLS configuration details.
-    """
-    
-    def get(self, request, scan_id: int):
-        """
-        Get detailed technical scan results.
-        """
-        scan = get_object_or_404(Scan, id=scan_id, user=request.user)
-        if scan.status != "completed":
-            return Response(
-                {"detail": f"Scan is {scan.status}. Results available after completion."},
-                status=status.HTTP_409_CONFLICT,
-            )
-        try:
-            result = scan.result  # OneToOne
-        except ScanResult.DoesNotExist:
-            return Response({"detail": "Results not found."}, status=status.HTTP_404_NOT_FOUND)
-
-        data = {
-            "scanId": f"s_{scan.id}",
-            "target": scan.target,
-            "mode": scan.mode,
-            "status": scan.status,
-            "result": ScanResultSerializer(result).data,
-        }
-        return Response(data, status=status.HTTP_200_OK)
-
-
-# Helper functions for report generation
-def _dur_str(start, end):
+    Same payload as ScanResultView, served under the report URL.
     """
-    Return a short human-readable duration (e.g. '1 min 22 sec').
-    """
-    try:
-        if not start or not end:
-            return "—"
-        if isinstance(start, str):
-            start = timezone.datetime.fromisoformat(start.replace("Z", "+00:00"))
-        if isinstance(end, str):
-            end = timezone.datetime.fromisoformat(end.replace("Z", "+00:00"))
-        delta: timedelta = end - start
-        secs = max(0, int(delta.total_seconds()))
-        return f"{secs // 60} min {secs % 60} sec"
-    except Exception:
-        return "—"
-
-
-def _sev_summary(vulns):
-    """
-    Aggregate counts by severity.
-    """
-    summary = {"critical": 0, "high": 0, "medium": 0, "low": 0, "info": 0}
-    for v in vulns:
-        sev = (v.get("severity") or "info").lower()
-        summary[sev] = summary.get(sev, 0) + 1
-    summary["total"] = sum(summary.values())
-    return summary
-
-
-def _pct(n, total):
-    """
-    Calculate percentage safely.
-    """
-    try:
-        return 0 if not total else round(n * 100 / total)
-    except Exception:
-        return 0
-
 
 
 class ScanDownloadView(AuthenticatedView):
@@ -447,9 +410,14 @@ class ScanDownloadView(AuthenticatedView):
         raw = fmt or request.GET.get("format") or request.GET.get("as") or "pdf"
         fmt = str(raw).strip().lower()
 
-        # 1) Fetch scan & check ownership
+        # 1) Fetch scan & check ownership (result joined; the report never
+        # shows the raw tool output)
         try:
-            scan = Scan.objects.get(id=scan_id, user=request.user)
+            scan = (
+                Scan.objects.select_related("result")
+                .defer("result__raw_output")
+                .get(id=scan_id, user=request.user)
+            )
         except Scan.DoesNotExist:
             return JsonResponse({"detail": "Scan not found."}, status=404)
 
@@ -465,19 +433,9 @@ class ScanDownloadView(AuthenticatedView):
         except ScanResult.DoesNotExist:
             result = None
 
-        vulns_qs = (
-            scan.vulnerabilities.all().order_by(
-                djm.Case(
-                    djm.When(severity="critical", then=djm.Value(0)),
-                    djm.When(severity="high",    then=djm.Value(1)),
-                    djm.When(severity="medium",  then=djm.Value(2)),
-                    djm.When(severity="low",     then=djm.Value(3)),
-                    djm.When(severity="info",    then=djm.Value(4)),
-                    default=djm.Value(5),
-                    output_field=djm.IntegerField(),
-                ),
-                "name",
-            )
+        # Plain rows: the report only needs these columns, no model instances
+        vulns_qs = scan.vulnerabilities.order_by("-severity_rank", "name").values(
+            "severity", "name", "path", "description", "remediation", "reference_links"
         )
 
         # 3) Build hosts structure compatible with template
@@ -498,13 +456,13 @@ class ScanDownloadView(AuthenticatedView):
         for v in vulns_qs:
             vulns.append(
                 {
-                    "severity": (v.severity or "info"),
-                    "name": v.name,
+                    "severity": (v["severity"] or "info"),
+                    "name": v["name"],
                     "host": scan.target,
-                    "path": v.path or "",
-                    "description": v.description or "",
-                    "remediation": v.remediation or "",
-                    "references": v.reference_links or [],
+                    "path": v["path"] or "",
+                    "description": v["description"] or "",
+                    "remediation": v["remediation"] or "",
+                    "references": v["reference_links"] or [],
                 }
             )
         if hosts:
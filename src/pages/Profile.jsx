@@ -132,6 +132,25 @@ export default function Profile() {
       }
 
       const data = await res.json();
+      if (res.status === 202) {
+        // Resized in the background; keep the local preview and poll until
+        // avatarUrl changes (its ?v= version is bumped when processing ends)
+        setMessage("Profile photo uploaded, processing...");
+        const previousUrl = data.user.avatarUrl;
+        for (let attempt = 0; attempt < 10; attempt++) {
+          await new Promise((resolve) => setTimeout(resolve, 1000));
+          const poll = await fetch(`${API_BASE_URL}/profile`, { credentials: "include" });
+          if (!poll.ok) break;
+          const polled = await poll.json();
+          if (polled.user.avatarUrl && polled.user.avatarUrl !== previousUrl) {
+            setProfileImage(polled.user.avatarUrl);
+            setProfile((prev) => ({ ...prev, avatarUrl: polled.user.avatarUrl }));
+            setMessage("Profile photo updated!");
+            break;
+          }
+        }
+        return;
+      }
       setProfileImage(data.user.avatarUrl);
       setProfile((prev) => ({ ...prev, avatarUrl: data.user.avatarUrl }));
       setMessage("Profile photo updated!");
@@ -0,0 +1,36 @@
+"""
+DRF renderers for the VulnScan API.
+"""
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson  # optional; several times faster than json.dumps
+except Exception:  # pragma: no cover - fall back to DRF's stdlib encoder
+    orjson = None
+
+
+class OrjsonRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson when it is installed.
+    
+    orjson encodes datetime/UUID natively, so serializers can hand back
+    raw datetimes instead of pre-formatting them. Types orjson doesn't know
+    (lazy translation strings, Decimal, querysets, ...) go through DRF's
+    JSONEncoder.default, the same hook the stock JSONRenderer uses. Without
+    orjson this behaves exactly like JSONRenderer.
+    """
+
+    _fallback_default = JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        return orjson.dumps(
+            data,
+            default=self._fallback_default,
+            option=orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS,
+        )
@@ -58,12 +58,22 @@ DATABASES = {
         "PASSWORD": os.getenv("DB_PASSWORD"),  # Database password from environment
         "HOST": os.getenv("DB_HOST"),          # Database host from environment
         "PORT": os.getenv("DB_PORT", "5432"),  # Database port (default: 5432)
+        # Reuse connections across requests/tasks instead of a TCP + TLS +
+        # auth handshake each time; health checks drop ones Neon has closed
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
         "OPTIONS": {
             "sslmode": os.getenv("DB_SSLMODE", "require"),  # SSL requirement for secure connection
         },
     }
 }
 
+# Optional psycopg 3 connection pool (needs psycopg[pool]); Django requires
+# CONN_MAX_AGE = 0 with it, the pool keeps the connections open instead
+if os.getenv("DB_POOL", "").lower() in ("1", "true", "yes"):
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"]["pool"] = True
+
 # Alternative database configuration using DATABASE_URL (commented out)
 # Uncomment this section if using a single DATABASE_URL environment variable
 """
@@ -169,6 +179,18 @@ TEMPLATES = [
 # WSGI application for deployment
 WSGI_APPLICATION = 'vulnscanner.wsgi.application'
 
+# =============================================================================
+# REST FRAMEWORK CONFIGURATION
+# =============================================================================
+
+# orjson-backed JSON output (falls back to DRF's encoder if orjson is missing)
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "vulnscanner.renderers.OrjsonRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+}
+
 # =============================================================================
 # PASSWORD VALIDATION
 # =============================================================================
@@ -189,6 +211,14 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Argon2id first; PBKDF2 stays listed so existing hashes keep verifying
+# and are re-hashed with Argon2 on the next successful login
+PASSWORD_HASHERS = [
+    "apps.auth_app.hashers.TunedArgon2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+
 # =============================================================================
 # INTERNATIONALIZATION
 # =============================================================================
@@ -220,6 +250,8 @@ CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:63
 # Task routing configuration - specific queues for different task types
 CELERY_TASK_ROUTES = {
     "apps.scans_app.tasks.run_scan_task": {"queue": "scans"},  # Route scan tasks to 'scans' queue
+    "apps.auth_app.tasks.process_avatar_task": {"queue": "media"},  # Avatar resizing off the request path
+    "apps.auth_app.tasks.delete_avatar_file": {"queue": "media"},    # Old avatar cleanup
 }
 
 # Task execution limits for resource management
@@ -239,6 +271,10 @@ CELERY_RESULT_SERIALIZER = "json"     # Serialize results as JSON
 MEDIA_URL = "/media/"                 # URL prefix for media files
 MEDIA_ROOT = BASE_DIR / "media"       # Filesystem path for media storage
 
+# Uploads above 1 MB spill to a temp file instead of being held in memory;
+# avatar uploads are then moved (not copied) into storage for the worker
+FILE_UPLOAD_MAX_MEMORY_SIZE = 1 * 1024 * 1024
+
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = '/static/'
 